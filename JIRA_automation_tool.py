@@ -11,7 +11,14 @@ import json
 import csv
 import time
 import random
+import threading
+from collections import deque, OrderedDict
+from urllib.parse import urlencode
 from getpass import getpass
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import JIRA_automation_tool_common as common
 
 # jira
 from jira import JIRA, JIRAError
@@ -29,8 +36,12 @@ import tkinter.messagebox as tm
 class ProjectMixin:    
     def getProjects(self):
         return self.get('/projects')
+
+    # 프로젝트를 페이지 단위로 받아 오면서 하나씩 돌려줌
+    def iterProjects(self):
+        return self.iter_pages('/projects')
         
-    def getProject(**kwargs):
+    def getProject(self, **kwargs):
         if not len(kwargs) == 1: 
             raise Exception('getProject method takes one argument in : name, id')
         elif kwargs.get('name', None):
@@ -40,37 +51,156 @@ class ProjectMixin:
         else:
             raise Exception('getProject method takes one argument in : name, id')
 
+# Codebeamer 연결 설정
+CODEBEAMER_POOL_SIZE = 10           # 다시 쓸 수 있게 열어 둘 연결 수
+CODEBEAMER_TIMEOUT = (5, 60)        # (연결, 응답) 제한 시간 초
+CODEBEAMER_RETRIES = 3              # 일시적인 오류(연결 실패, 429/5xx) 시 다시 시도할 횟수
+CODEBEAMER_BACKOFF_FACTOR = 0.5     # 다시 시도할 때마다 0.5, 1, 2...초씩 늘려가며 기다림
+CODEBEAMER_LATENCY_SAMPLES = 1000   # 응답 시간 통계에 쓸 최근 응답 수
+CODEBEAMER_PAGE_SIZE = 100          # 목록을 페이지 단위로 받을 때 한 페이지의 항목 수
+CODEBEAMER_CACHE_SIZE = 256         # ETag/Last-Modified로 다시 확인할 GET 응답을 기억해 둘 수
+
 class Codebeamer(ProjectMixin):
-    def __init__(self, url, login, password):
+    def __init__(self, url, login, password, timeout=CODEBEAMER_TIMEOUT, retries=CODEBEAMER_RETRIES, pool_size=CODEBEAMER_POOL_SIZE):
         self.base_url = url
         self.auth = (login, password)
+        self.timeout = timeout
+
+        # 모든 요청이 함께 쓰는 세션 (keep-alive로 연결을 다시 씀)
+        # POST는 같은 항목이 두 번 만들어질 수 있으므로 다시 시도하지 않음 (Retry 기본값)
+        retry = Retry(total=retries, backoff_factor=CODEBEAMER_BACKOFF_FACTOR, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.verify = True
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # 응답 시간 기록 (최근 CODEBEAMER_LATENCY_SAMPLES개)
+        self.latencies = deque(maxlen=CODEBEAMER_LATENCY_SAMPLES)
+        self.session.hooks['response'].append(self.record_latency)
+
+        # GET 응답 캐시: URI -> (ETag, Last-Modified, 응답 내용)
+        # 다음 GET 때 If-None-Match/If-Modified-Since를 보내고 304를 받으면 기억해 둔 내용을 씀
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def record_latency(self, res, *args, **kwargs):
+        self.latencies.append(res.elapsed.total_seconds())
+
+    # 응답 시간 통계 (초)
+    def latency_stats(self):
+        latencies = sorted(self.latencies)
+        if len(latencies) == 0:
+            return {'count': 0}
+        return {
+            'count': len(latencies),
+            'average': sum(latencies) / len(latencies),
+            'min': latencies[0],
+            'p50': latencies[len(latencies) // 2],
+            'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            'max': latencies[-1],
+        }
+
+    # 캐시 사용 통계
+    def cache_stats(self):
+        with self.cache_lock:
+            return {'hits': self.cache_hits, 'misses': self.cache_misses, 'size': len(self.cache)}
+
+    def close(self):
+        self.session.close()
 
-    def get(self, uri):
+    # 요청 통계 (예: with codebeamer.request_stats('트래커 읽기'): ...)
+    def request_stats(self, name, filename=None):
+        return common.RequestStats(name, [self.session], filename)
+
+    def get(self, uri, params=None):
         url = self.base_url + uri
-        res = requests.get(url, auth=self.auth, verify=True)
+        cache_key = url if not params else url + '?' + urlencode(sorted(params.items()))
+
+        # 기억해 둔 응답이 있으면 바뀌었을 때만 내용을 받음
+        headers = {}
+        with self.cache_lock:
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            etag, last_modified, data = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        res = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if res.status_code == 304 and cached is not None:
+            with self.cache_lock:
+                self.cache_hits = self.cache_hits + 1
+                if cache_key in self.cache:
+                    self.cache.move_to_end(cache_key)
+            return cached[2]
+
+        with self.cache_lock:
+            self.cache_misses = self.cache_misses + 1
         if res.status_code == 200:
-            return json.loads(res.content)
+            data = res.json()
+            etag = res.headers.get('ETag')
+            last_modified = res.headers.get('Last-Modified')
+            if etag or last_modified:
+                with self.cache_lock:
+                    self.cache[cache_key] = (etag, last_modified, data)
+                    self.cache.move_to_end(cache_key)
+                    while len(self.cache) > CODEBEAMER_CACHE_SIZE:
+                        self.cache.popitem(last=False)
+            return data
         else:
             print(f"Warning : GET error ({url})")
-            return json.loads(res.content)
+            return res.json()
+
+    # 목록을 페이지 단위로 (page=1, 2, ...) 받아 오면서 항목을 하나씩 돌려줌
+    # 페이지를 나누지 않는 API (목록을 그대로 돌려줌)는 한 번만 요청함
+    def iter_pages(self, uri, page_size=CODEBEAMER_PAGE_SIZE):
+        page = 1
+        while True:
+            data = self.get(uri, params={'page': page, 'pageSize': page_size})
+            if isinstance(data, list):
+                for item in data:
+                    yield item
+                return
+
+            items = None
+            for items_key in ('itemRefs', 'items', 'projects', 'trackers'):
+                if items_key in data:
+                    items = data[items_key]
+                    break
+            if not items:
+                return
+            for item in items:
+                yield item
+
+            total = data.get('total')
+            if total is not None and page * page_size >= total:
+                return
+            if len(items) < page_size:
+                return
+            page = page + 1
 
     def put(self, uri, data):
         url = self.base_url + uri
-        res = requests.put(url, json=data, auth=self.auth, verify=True)
+        res = self.session.put(url, json=data, timeout=self.timeout)
         if res.status_code == 200:
-            return json.loads(res.content)
+            return res.json()
         else:
             print(f"Warning : PUT error ({url})")
-            return json.loads(res.content)
+            return res.json()
 
     def post(self, uri, data):
         url = self.base_url + uri
-        res = requests.post(url, json=data, auth=self.auth, verify=True)
+        res = self.session.post(url, json=data, timeout=self.timeout)
         if res.status_code == 201:
-            return json.loads(res.content)
+            return res.json()
         else:
             print(f"Warning : POST error ({url})")
-            return json.loads(res.content)
+            return res.json()
 
 ########## 환경변수
 VLM_url = 'http://vlm.lge.com/issue/'
@@ -94,8 +224,23 @@ except JIRAError as err:
 
 print("    사용자 \'%s\' 로그인 성공" % username)
 print("=" * 100)
+
+jira = common.open_transport(jira, VLM_url, username, password)
+
+########## 로컬 이슈 저장소, 사용자 캐시 열기
+store = common.IssueStore(os.path.join(os.path.dirname(__file__), common.ISSUE_STORE_FILENAME))
+users = common.UserResolver(jira, os.path.join(os.path.dirname(__file__), common.USER_CACHE_FILENAME))
+common.load_field_ids(jira, os.path.join(os.path.dirname(__file__), common.FIELD_CACHE_FILENAME))
 #tm.showinfo('로그인 성공', username)
 
+########## 요청 통계
+# 기능을 실행하는 동안 보낸 요청을 엔드포인트별로 모아서, 끝나면 콘솔에 보여주고 파일에 쌓아 둠
+def with_request_stats(name, function):
+    def run():
+        with common.RequestStats(name, [jira._session], os.path.join(os.path.dirname(__file__), common.REQUEST_STATS_FILENAME)):
+            function()
+    return run
+
 ########## 메인(기능 선택) 창 보여주기
 mainWindow = Tk()
 mainWindow.title('기능 선택하기')
@@ -108,8 +253,9 @@ def get_issues_sample():
     tk.Label(childWindow, text = "다음 쿼리를 실행하여 나온 결과 중 최초 10개만 콘솔에 보여 드립니다.").grid(row = 0, column = 0)
     tk.Label(childWindow, text = query).grid(row = 1, column = 0)
 
-    issues = jira.search_issues(query, startAt=1, maxResults=10)
-    for issue in issues:
+    issues = jira.search_issues(query, startAt=1, maxResults=10, fields=common.export_fields())
+    watcher_lists = common.fetch_watcher_lists(jira, issues)
+    for issue, watcher_list in zip(issues, watcher_lists):
         try:
             print("Parent: %s" % issue.fields.parent)
         except AttributeError as err:
@@ -123,14 +269,13 @@ def get_issues_sample():
         for component in issue.fields.components:
             print("  Components: %s" % component.name)
         print("  Labels: %s" % issue.fields.labels)
-        print("  HMC프로젝트: %s" % issue.get_field('customfield_43801'))   # ID: 'customfield_43801', name: 'HMC프로젝트' (커스텀 필드의 값은 jira.fields() 함수로 찾을 수 있음)
+        print("  HMC프로젝트: %s" % issue.get_field(common.field_id(common.HMC_PROJECT_FIELD)))   # 커스텀 필드 ID는 로그인할 때 jira.fields()로 찾아 둠
         print("  Status@: %s" % issue.fields.status)
         print("  Resolution@: %s" % issue.fields.resolution)
         print("People")
         print("  Assignee: %s" % issue.fields.assignee)
         print("  Reporter@: %s" % issue.fields.reporter)
-        watchers = jira.watchers(issue)
-        for watcher in watchers.watchers:
+        for watcher in watcher_list:
             print("  Watcher: %s" % watcher)
         print("Dates")
         print("  Due: %s" % issue.fields.duedate)
@@ -153,8 +298,8 @@ def make_an_issue_sample():
         'priority': {'name': 'P2'},
         'components': [{'name': 'ES94111-01'}],
         'labels': ['ccIC24_CLU_WBS'],
-        'customfield_43801': {'value': 'ccIC24'},       # HMC프로젝트
-        'customfield_10104': {'value': 'Comment'},      # Severity
+        common.field_id(common.HMC_PROJECT_FIELD): {'value': 'ccIC24'},
+        common.field_id(common.SEVERITY_FIELD): {'value': 'Comment'},
         'assignee': {'name': 'jimin91.song'},
         'duedate': '2023-08-30',
         'description': '설명 텍스트입니다',
@@ -166,90 +311,40 @@ def make_an_issue_sample():
     print('입력한 정보: ', issue_dict)
     new_issue = jira.create_issue(issue_dict)
     # Watcher 정보는 따로 추가해야 함
-    jira.add_watcher(new_issue, jira._get_user_id('soonbum.jeong'))
-    #jira.remove_watcher(new_issue, jira._get_user_id('soonbum.jeong'))
+    common.add_watcher_id(jira, new_issue.key, users.resolve('soonbum.jeong'))
+    #common.remove_watcher_id(jira, new_issue.key, users.resolve('soonbum.jeong'))
     print('생성된 이슈: ', new_issue)
 
 tk.Label(mainWindow, text = "샘플 테스트").grid(row = 0, column = 0, padx = 10, pady = 5)
-tk.Button(mainWindow, text = "이슈 보기 (10개만)", command = get_issues_sample).grid(row = 0, column = 1, padx = 10, pady = 5, sticky="w")
-tk.Button(mainWindow, text = "이슈 생성 (1개만)", command = make_an_issue_sample).grid(row = 1, column = 1, padx = 10, pady = 5, sticky="w")
+tk.Button(mainWindow, text = "이슈 보기 (10개만)", command = with_request_stats("이슈 보기 (10개만)", get_issues_sample)).grid(row = 0, column = 1, padx = 10, pady = 5, sticky="w")
+tk.Button(mainWindow, text = "이슈 생성 (1개만)", command = with_request_stats("이슈 생성 (1개만)", make_an_issue_sample)).grid(row = 1, column = 1, padx = 10, pady = 5, sticky="w")
 
 # 이슈 관리 - 이슈 수집하기 (CSV)
 def collect_all_issues():
-    # 모든 이슈를 가져옴
+    # 모든 이슈를 페이지 단위로 가져와서 바로 csv 파일(과 EXPORT_FORMATS의 다른 형식 파일)에 기록함
     query = 'project in (HKMCCLUHUD) AND summary ~ ccIC24'
-    issues = jira.search_issues(query, maxResults=0)
-
-    # csv 파일 헤더 작성
-    filename_to_write = os.path.dirname(__file__) + '\\[HKMCCLUHUD][ccIC24] issues.csv'
-    with open(filename_to_write, 'w', encoding='euc-kr', newline='') as data_to_write:
-        csvwriter = csv.writer(data_to_write, delimiter=',')
-        csvwriter.writerow(['update', 'key*', 'project*', 'summary', 'issuetype', 'priority', 'components', 'labels', 'HMC프로젝트', 'status*', 'resolution*', 'assignee', 'reporter*', 'watchers', 'duedate', 'created*', 'description'])
+    filename_to_write = common.EXPORT_FILENAME
+    count = common.export_issues_csv(jira, query, filename_to_write, store=store)
+    print("이슈 수집하기: %d개 이슈를 기록했습니다." % count)
 
-    # 이슈를 csv 파일에 기록하기
-    for issue in issues:
-        components = []
-        for component in issue.fields.components:
-            components.append(component.name)
-
-        hmcProject = issue.get_field('customfield_43801')
-
-        watcher_list = []
-        watchers = jira.watchers(issue)
-        for watcher in watchers.watchers:
-            watcher_list.append(str(watcher))
-
-        with open(filename_to_write, 'a', encoding='euc-kr', newline='') as data_to_write:
-            csvwriter = csv.writer(data_to_write, delimiter=',')
-            try:
-                csvwriter.writerow(['', issue.key, issue.fields.project, issue.fields.summary, issue.fields.issuetype, issue.fields.priority, components, issue.fields.labels, hmcProject, issue.fields.status, issue.fields.resolution, issue.fields.assignee, issue.fields.reporter, watcher_list, issue.fields.duedate, issue.fields.created, issue.fields.description])
-            except UnicodeEncodeError as err:
-                print("%s" % issue.key)
-                print("    {} **".format(err))
-                description_str = str(issue.fields.description)
-                description = description_str.encode(encoding = "euc-kr", errors = "ignore")
-                csvwriter.writerow(['', issue.key, issue.fields.project, issue.fields.summary, issue.fields.issuetype, issue.fields.priority, components, issue.fields.labels, hmcProject, issue.fields.status, issue.fields.resolution, issue.fields.assignee, issue.fields.reporter, watcher_list, issue.fields.duedate, issue.fields.created, description])
+# 이슈 관리 - 이슈 변경분 수집하기 (CSV)
+def collect_updated_issues():
+    # 지난번 수집 이후에 바뀐 이슈만 가져와서 기존 csv 파일에 합침
+    query = 'project in (HKMCCLUHUD) AND summary ~ ccIC24'
+    filename_to_write = common.EXPORT_FILENAME
+    count = common.export_updated_issues_csv(jira, query, filename_to_write, store=store)
+    print("이슈 변경분 수집하기: %d개 이슈를 기록했습니다." % count)
 
 # 이슈 관리 - 이슈 업데이트 (CSV)
 def update_all_issues():
     # csv 파일 가져오기
-    filename_to_read = os.path.dirname(__file__) + '\\[HKMCCLUHUD][ccIC24] issues.csv'
-    with open(filename_to_read, 'r', encoding='euc-kr', newline='') as data_to_read:
-        for line in csv.reader(data_to_read):
-            if(line[0] != 'update'):    # 머리말이 아닐 경우에만 다음 절차 진행
-                if(line[0] != ''):      # 업데이트 flag가 입력되어 있을 경우
-                    # 키를 이용하여 이슈 가져오기
-                    issue = jira.issue(line[1])
-
-                    components_str = json.loads(line[6].replace("'", "\""))
-                    labels_str = json.loads(line[7].replace("'", "\""))
-                    components = []
-                    for component in components_str:
-                        components.append({'name': component})
-                    labels = []
-                    for label in labels_str:
-                        labels.append(label)
-                    issue_dict = {
-                        'summary': line[3],
-                        'issuetype': {'name': line[4]},
-                        'priority': {'name': line[5]},
-                        'components': components,
-                        'labels': labels,
-                        'customfield_43801': {'value': line[8]},       # HMC프로젝트
-                        'assignee': {'name': line[11].split(' ')[-1]},
-                        'duedate': line[14],
-                        'description': line[16],
-                    }
-                    issue.update(notify = True, fields = issue_dict)
-                    
-                    # Watcher 추가
-                    watchers_str = json.loads(line[13].replace("'", "\""))
-                    for watcher in watchers_str:
-                        jira.add_watcher(issue, jira._get_user_id(str(watcher).split(' ')[-1]))
+    filename_to_read = common.EXPORT_FILENAME
+    common.update_issues_from_csv(jira, store, users, filename_to_read)
 
 tk.Label(mainWindow, text = "이슈 관리").grid(row = 2, column = 0, padx = 10, pady = 5)
-tk.Button(mainWindow, text = "이슈 수집하기 (CSV)", command = collect_all_issues).grid(row = 2, column = 1, padx = 10, pady = 5, sticky="w")
-tk.Button(mainWindow, text = "이슈 업데이트 (CSV)", command = update_all_issues).grid(row = 3, column = 1, padx = 10, pady = 5, sticky="w")
+tk.Button(mainWindow, text = "이슈 수집하기 (CSV)", command = with_request_stats("이슈 수집하기 (CSV)", collect_all_issues)).grid(row = 2, column = 1, padx = 10, pady = 5, sticky="w")
+tk.Button(mainWindow, text = "이슈 변경분 수집하기 (CSV)", command = with_request_stats("이슈 변경분 수집하기 (CSV)", collect_updated_issues)).grid(row = 2, column = 2, padx = 10, pady = 5, sticky="w")
+tk.Button(mainWindow, text = "이슈 업데이트 (CSV)", command = with_request_stats("이슈 업데이트 (CSV)", update_all_issues)).grid(row = 3, column = 1, padx = 10, pady = 5, sticky="w")
 
 # 커스텀 기능 - 이슈 복사하고 제목 바꾸기
 def custom_issue_cloning_and_renaming():
@@ -259,77 +354,12 @@ def custom_issue_cloning_and_renaming():
     old_title = input("이전 제목(예: Analysis): ")
     new_title = input("새로운 제목(예: SyRS): ")
     due_date = input("마감기한(예: 2023-08-31): ")
-    delay_seconds = input("업데이트 딜레이 초(120): ")
-
-    # 제목이 old_title인 이슈를 가져옴
-    query = "project in (HKMCCLUHUD) AND summary ~ ccIC24 AND summary ~ WBS3 AND summary ~ %s" % old_title
-    issues = jira.search_issues(query, maxResults=0)
-
-    seq = 1
-    for issue in issues:
-        print("\n[%d] %s: %s" % (seq, issue.key, issue.fields.summary))
-
-        components = []
-        for component in issue.fields.components:
-            components.append({'name': str(component.name)})
-        labels = []
-        for label in issue.fields.labels:
-            labels.append(label)
-        issue_dict = {
-            'project': str(issue.fields.project),
-            'summary': str(issue.fields.summary).replace(old_title, new_title),
-            'issuetype': {'name': str(issue.fields.issuetype)},
-            'priority': {'name': str(issue.fields.priority)},
-            'components': components,
-            'labels': labels,
-            'customfield_43801': {'value': str(issue.get_field('customfield_43801'))},       # HMC프로젝트
-            'assignee': {'name': str(issue.fields.assignee).split(' ')[-1]},     # 마지막 영문 이름만 사용하기
-            'duedate': due_date,
-            'description': str(issue.fields.description),            
-            'parent': {'key': str(issue.fields.parent.key)},       # Sub-task의 경우 parent를 지정해야 함
-            'versions': [{'name': 'None'}],     # Affects Versions
-            'fixVersions': [{'name': 'None'}],  # Fix Versions
-        }
-        print('  입력한 정보: ', issue_dict)
-
-        # 만약 이미 생성된 제목이 있는지 확인할 것
-        another_query = "project in (HKMCCLUHUD) AND summary ~ ccIC24 AND summary ~ WBS3 AND summary ~ %s" % new_title
-        another_issues = jira.search_issues(another_query, maxResults=0)
-        find_already_made_issue = False
-        for another_issue in another_issues:
-            # another_issue 중에는 "...]Analysis"도 있고 "...] Analysis"도 있을 수 있다.
-            comparison_str_1 = str(another_issue.fields.summary)
-            comparison_str_2 = ''
-            if(comparison_str_1.find('] ' + new_title) != -1):
-                comparison_str_2 = str(comparison_str_1.replace(('] ' + new_title), (']' + new_title)))
-            else:
-                comparison_str_2 = str(comparison_str_1.replace((']' + new_title), ('] ' + new_title)))
-            # 제목 맨 앞에 공백 문자가 들어가는 경우도 있을 수 있다.
-            comparison_str_3 = ' ' + comparison_str_1
-            comparison_str_4 = ' ' + comparison_str_2
-
-            if(str(issue.fields.summary.replace(old_title, new_title)) == comparison_str_1):
-                find_already_made_issue = True
-            if(str(issue.fields.summary.replace(old_title, new_title)) == comparison_str_2):
-                find_already_made_issue = True
-            if(str(issue.fields.summary.replace(old_title, new_title)) == comparison_str_3):
-                find_already_made_issue = True
-            if(str(issue.fields.summary.replace(old_title, new_title)) == comparison_str_4):
-                find_already_made_issue = True
-
-        # 아직 이슈를 생성하지 않았다면 만들 것
-        if(find_already_made_issue == False):
-            new_issue = jira.create_issue(issue_dict)
-            # Watcher 정보는 따로 추가해야 함
-            watchers = jira.watchers(issue)
-            for watcher in watchers.watchers:
-                jira.add_watcher(new_issue, jira._get_user_id(watcher))
-            print('[%d] 생성된 이슈: %s' % (seq, new_issue))
-            time.sleep(int(delay_seconds))  # delay_seconds초 대기
-        else:
-            print('[%d] 이미 생성된 이슈: %s' % (seq, issue.key))
+    requests_per_second = common.parse_number(input("초당 요청 수(%s): " % common.WRITE_REQUESTS_PER_SECOND), common.WRITE_REQUESTS_PER_SECOND)
+    workers = common.parse_number(input("동시 작업 수(%d): " % common.WRITE_WORKERS), common.WRITE_WORKERS)
 
-        seq = seq + 1
+    # 제목이 old_title인 이슈를 로컬 이슈 저장소에서 찾아서 복사함
+    query = "project in (HKMCCLUHUD) AND summary ~ ccIC24 AND summary ~ WBS3"
+    common.clone_and_rename_issues(jira, store, users, query, old_title, new_title, due_date, workers, requests_per_second)
 
     print("이슈 복사하고 제목 바꾸기: 작업을 완료했습니다.")
 
@@ -343,30 +373,11 @@ def add_watchers_of_specific_person():
     for i in range(int(nPersons)):
         name_to_add = input("%d번째 이름을 입력하세요: " % (i+1))
         watcher_list.append(name_to_add)
-    delay_seconds = input("업데이트 딜레이 초(30): ")
+    requests_per_second = common.parse_number(input("초당 요청 수(%s): " % common.WRITE_REQUESTS_PER_SECOND), common.WRITE_REQUESTS_PER_SECOND)
+    workers = common.parse_number(input("동시 작업 수(%d): " % common.WRITE_WORKERS), common.WRITE_WORKERS)
 
     query = "project in (HKMCCLUHUD) AND summary ~ ccIC24"
-    issues = jira.search_issues(query, maxResults=0)
-    find_person = False
-    seq = 1
-    for issue in issues:
-        # name_to_find에 입력된 이름이 이슈의 assignee 또는 watcher에 있는지 찾아볼 것
-        find_person = False
-        if(str(issue.fields.assignee).split(' ')[-1] == name_to_find):
-            find_person = True
-        watchers = jira.watchers(issue)
-        for watcher in watchers.watchers:
-            if(str(watcher).split(' ')[-1] == name_to_find):
-                find_person = True
-
-        # 이름을 찾았으면 추가하고 싶었던 watcher를 추가함
-        if(find_person == True):
-            for watcher_name in watcher_list:
-                jira.add_watcher(issue, watcher_name)
-            print("[%d][%s : %s] 특정 assignee/watcher인 이슈에 watcher 추가하기: 작업 완료" % (seq, issue.key, issue.fields.summary))
-
-        time.sleep(int(delay_seconds))  # delay_seconds초 대기
-        seq = seq + 1
+    common.add_watchers_to_issues_involving(jira, store, users, query, name_to_find, watcher_list, workers, requests_per_second)
 
     print("특정 assignee/watcher인 이슈에 watcher 추가하기: 작업을 완료했습니다.")
 
@@ -375,30 +386,16 @@ def del_watcher_from_all_issues():
     name_to_delete = input("지우고 싶은 watcher 이름을 입력하세요(예: jimin91.song): ")
 
     query = "project in (HKMCCLUHUD) AND summary ~ ccIC24"
-    issues = jira.search_issues(query, maxResults=0)
-    find_person = False
-    seq = 1
-    for issue in issues:
-        # name_to_delete에 입력된 이름이 이슈의 watcher에 있는지 찾아볼 것
-        find_person = False
-        watchers = jira.watchers(issue)
-        for watcher in watchers.watchers:
-            if(str(watcher).split(' ')[-1] == name_to_delete):
-                find_person = True
-
-        # 이름을 찾았으면 지우고 싶었던 watcher를 제거함
-        if(find_person == True):
-            jira.remove_watcher(issue, jira._get_user_id(name_to_delete))
-            print("[%d][%s : %s] 특정 watcher를 모든 이슈에서 제거하기: 작업 완료" % (seq, issue.key, issue.fields.summary))
-        
-        seq = seq + 1
-    
+    common.remove_watcher_from_issues(jira, store, users, query, name_to_delete)
+
     print("특정 watcher를 모든 이슈에서 제거하기: 작업을 완료했습니다.")
 
 tk.Label(mainWindow, text = "커스텀 기능").grid(row = 4, column = 0, padx = 10, pady = 10)
-tk.Button(mainWindow, text = "이슈 복사하고 제목 바꾸기", command = custom_issue_cloning_and_renaming).grid(row = 4, column = 1, padx = 10, pady = 5, sticky="w")
-tk.Button(mainWindow, text = "특정 assignee/watcher인 이슈에 watcher 추가하기", command = add_watchers_of_specific_person).grid(row = 5, column = 1, padx = 10, pady = 5, sticky="w")
-tk.Button(mainWindow, text = "특정 watcher를 모든 이슈에서 제거하기", command = del_watcher_from_all_issues).grid(row = 6, column = 1, padx = 10, pady = 5, sticky="w")
+tk.Button(mainWindow, text = "이슈 복사하고 제목 바꾸기", command = with_request_stats("이슈 복사하고 제목 바꾸기", custom_issue_cloning_and_renaming)).grid(row = 4, column = 1, padx = 10, pady = 5, sticky="w")
+tk.Button(mainWindow, text = "특정 assignee/watcher인 이슈에 watcher 추가하기", command = with_request_stats("특정 assignee/watcher인 이슈에 watcher 추가하기", add_watchers_of_specific_person)).grid(row = 5, column = 1, padx = 10, pady = 5, sticky="w")
+tk.Button(mainWindow, text = "특정 watcher를 모든 이슈에서 제거하기", command = with_request_stats("특정 watcher를 모든 이슈에서 제거하기", del_watcher_from_all_issues)).grid(row = 6, column = 1, padx = 10, pady = 5, sticky="w")
 
 mainWindow.mainloop()
 jira.close()
+store.close()
+users.save()
@@ -0,0 +1,341 @@
+# JIRA 자동화 도구 - asyncio 기반 Jira 전송 계층 (선택 사항, pip install aiohttp 필요)
+# JIRA_automation_tool_common.USE_ASYNC_TRANSPORT = True 이면 로그인 후 jira 클라이언트 대신 AsyncJira를 씀
+#
+# 도구가 쓰는 jira.JIRA 함수 (search_issues, issue, create_issue(s), watchers, add_watcher, remove_watcher,
+# _get_user_id, _session.put)만 같은 모양으로 제공하고, 실제 요청은 백그라운드 스레드의 이벤트 루프 하나에서
+# aiohttp 세션 하나(연결 풀 공유)로 동시에 보냄. 동시에 보내는 요청 수는 concurrency개로 제한함.
+# 여기서 제공하지 않는 함수는 원래 jira 클라이언트로 넘김.
+
+import json
+import time
+import asyncio
+import threading
+
+import aiohttp
+from jira import JIRAError
+
+########## 환경변수
+ASYNC_CONCURRENCY = 16          # 동시에 보낼 최대 요청 수 (연결 풀 크기)
+ASYNC_TIMEOUT_SECONDS = 120     # 요청 하나의 제한 시간 초
+ASYNC_RETRIES = 3               # 429/503 응답 시 다시 시도할 횟수
+ASYNC_BACKOFF_SECONDS = 1.0     # Retry-After가 없을 때 다시 시도하기 전에 기다릴 초 (시도마다 2배)
+
+########## 응답 객체
+# jira.resources.Resource처럼 raw JSON의 값을 속성으로 읽을 수 있게 함
+class RawResource:
+    # str()로 보여줄 값을 찾는 순서 (jira.resources.Resource와 같음)
+    READABLE_IDS = ('displayName', 'key', 'name', 'accountId', 'filename', 'value', 'scope', 'votes', 'id', 'mimeType', 'closed')
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('raw')
+        if raw is None or name not in raw:
+            raise AttributeError(name)
+        return wrap_raw(raw[name])
+
+    def __str__(self):
+        for name in self.READABLE_IDS:
+            if name in self.raw:
+                return str(self.raw[name])
+        return repr(self.raw)
+
+    def __repr__(self):
+        return '<RawResource %s>' % str(self)
+
+class RawIssue(RawResource):
+    def __str__(self):
+        return str(self.raw.get('key'))
+
+    def get_field(self, field_name):
+        return getattr(self.fields, field_name)
+
+def wrap_raw(value):
+    if isinstance(value, dict):
+        return RawResource(value)
+    if isinstance(value, list):
+        return [wrap_raw(item) for item in value]
+    return value
+
+# jira의 ResultList처럼 total을 가진 이슈 목록
+class RawResultList(list):
+    def __init__(self, issues, total):
+        list.__init__(self, issues)
+        self.total = total
+
+# requests 응답 hook에 넘겨줄 요청/응답 (method, url, body / status_code, headers, elapsed, content)
+class AsyncRequest:
+    def __init__(self, method, url, body):
+        self.method = method
+        self.url = url
+        self.body = body
+
+class AsyncResponse:
+    def __init__(self, request, status_code, headers, body, elapsed):
+        self.request = request
+        self.url = request.url
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+
+    @property
+    def content(self):
+        return self.body
+
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+
+    def json(self):
+        if len(self.body) == 0:
+            return None
+        return json.loads(self.body)
+
+class Elapsed:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def total_seconds(self):
+        return self.seconds
+
+# 공통 기능이 jira._session에 하는 일 (hook 등록, 연결 풀 설정, PUT)을 AsyncJira로 넘겨줌
+class AsyncSessionAdapter:
+    def __init__(self, transport):
+        self.transport = transport
+        self.hooks = {'response': []}
+        self.pool_size = transport.concurrency
+
+    # 연결 풀은 AsyncJira의 concurrency로 정해지므로 따로 설정하지 않음
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, params=None, **kwargs):
+        return self.transport.run(self.transport.request('GET', url, params=params))
+
+    def put(self, url, params=None, data=None, **kwargs):
+        return self.transport.run(self.transport.request('PUT', url, params=params, data=data))
+
+    def post(self, url, params=None, data=None, **kwargs):
+        return self.transport.run(self.transport.request('POST', url, params=params, data=data))
+
+    def delete(self, url, params=None, **kwargs):
+        return self.transport.run(self.transport.request('DELETE', url, params=params))
+
+########## asyncio 전송 계층
+class AsyncJira:
+    def __init__(self, jira, server, basic_auth, concurrency=ASYNC_CONCURRENCY):
+        self.jira = jira
+        self.base_url = server.rstrip('/') + '/rest/api/2/'
+        self.concurrency = concurrency
+
+        # 이벤트 루프는 백그라운드 스레드 하나에서 계속 돌림
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.session = self.run(self.open_session(basic_auth))
+        self._session = AsyncSessionAdapter(self)
+
+    async def open_session(self, basic_auth):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency)
+        return aiohttp.ClientSession(
+            connector=connector,
+            auth=aiohttp.BasicAuth(basic_auth[0], basic_auth[1]),
+            timeout=aiohttp.ClientTimeout(total=ASYNC_TIMEOUT_SECONDS),
+            headers={'Content-Type': 'application/json', 'Accept': 'application/json'})
+
+    def close(self):
+        self.run(self.session.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.jira.close()
+
+    # 여기서 제공하지 않는 함수는 원래 jira 클라이언트로 넘김
+    def __getattr__(self, name):
+        return getattr(self.__dict__['jira'], name)
+
+    # 다른 스레드에서 코루틴을 실행하고 결과를 기다림
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    # 코루틴 여러 개를 동시에 실행하고 결과를 순서대로 돌려줌
+    def run_all(self, coroutines):
+        async def gather():
+            return await asyncio.gather(*coroutines)
+        return self.run(gather())
+
+    def _get_url(self, path):
+        return self.base_url + path
+
+    # 요청 하나 (429/503이면 Retry-After 또는 backoff만큼 기다렸다가 다시 시도함)
+    async def request(self, method, url, params=None, data=None):
+        if not url.startswith('http'):
+            url = self._get_url(url)
+        if params is not None:
+            params = {name: str(value).lower() if isinstance(value, bool) else str(value) for name, value in params.items()}
+
+        backoff = ASYNC_BACKOFF_SECONDS
+        for attempt in range(ASYNC_RETRIES + 1):
+            async with self.semaphore:
+                started = time.monotonic()
+                async with self.session.request(method, url, params=params, data=data) as res:
+                    body = await res.read()
+                    response = AsyncResponse(AsyncRequest(method, str(res.url), data), res.status, dict(res.headers), body, Elapsed(time.monotonic() - started))
+            for hook in list(self._session.hooks['response']):
+                hook(response)
+
+            if response.status_code in (429, 503) and attempt < ASYNC_RETRIES:
+                retry_after = response.headers.get('Retry-After')
+                try:
+                    wait_seconds = float(retry_after)
+                except (TypeError, ValueError):
+                    wait_seconds = backoff
+                await asyncio.sleep(wait_seconds)
+                backoff = backoff * 2
+                continue
+            break
+
+        if response.status_code >= 400:
+            raise JIRAError(text=response.text, status_code=response.status_code, url=url)
+        return response
+
+    ########## 읽기
+    async def search_issues_async(self, jql_str, startAt=0, maxResults=50, fields=None, validate_query=True, json_result=False):
+        params = {'jql': jql_str, 'startAt': startAt, 'maxResults': maxResults, 'validateQuery': validate_query}
+        if fields is not None:
+            if isinstance(fields, str):
+                params['fields'] = fields
+            else:
+                params['fields'] = ','.join(fields)
+        data = (await self.request('GET', 'search', params=params)).json()
+        if json_result:
+            return data
+        return RawResultList([RawIssue(raw) for raw in data['issues']], data['total'])
+
+    # jira.JIRA.search_issues와 같음 (maxResults가 0이면 모두 가져옴, json_result이면 응답 JSON 그대로)
+    def search_issues(self, jql_str, startAt=0, maxResults=50, validate_query=True, fields=None, json_result=False, **kwargs):
+        if maxResults or json_result:
+            return self.run(self.search_issues_async(jql_str, startAt, maxResults, fields, validate_query, json_result))
+        issues = RawResultList([], 0)
+        while True:
+            page = self.run(self.search_issues_async(jql_str, startAt + len(issues), 100, fields, validate_query))
+            issues.extend(page)
+            issues.total = page.total
+            if len(page) == 0 or startAt + len(issues) >= page.total:
+                return issues
+
+    async def issue_async(self, key, fields=None):
+        params = None
+        if fields is not None:
+            params = {'fields': fields if isinstance(fields, str) else ','.join(fields)}
+        return RawIssue((await self.request('GET', 'issue/' + str(key), params=params)).json())
+
+    def issue(self, id, fields=None, **kwargs):
+        return self.run(self.issue_async(id, fields))
+
+    async def watchers_async(self, issue):
+        return RawResource((await self.request('GET', 'issue/%s/watchers' % issue)).json())
+
+    def watchers(self, issue):
+        return self.run(self.watchers_async(issue))
+
+    # 여러 이슈의 watcher 목록을 한 번에 동시에 가져옴 (결과는 issues 순서 그대로, 표시 이름 목록)
+    def watcher_lists(self, issues):
+        watchers_list = self.run_all([self.watchers_async(issue) for issue in issues])
+        return [[str(watcher) for watcher in watchers.watchers] for watchers in watchers_list]
+
+    # Jira Cloud는 사용자 이름 대신 query로 찾고 accountId로 구분함
+    def is_cloud(self):
+        return getattr(self.jira, '_is_cloud', False)
+
+    # jira.JIRA._get_user_id처럼 찾은 사용자가 없으면 JIRAError를 발생시키고,
+    # 여러 명이면 ID가 user와 같은 사용자를, 없으면 첫 번째 사용자를 씀
+    async def get_user_id_async(self, user):
+        if user in (None, -1, '-1'):
+            return user
+        if self.is_cloud():
+            params = {'query': user, 'maxResults': 20}
+            id_name = 'accountId'
+        else:
+            params = {'username': user, 'maxResults': 20}
+            id_name = 'name'
+        users = (await self.request('GET', 'user/search', params=params)).json()
+        if len(users) < 1:
+            raise JIRAError("No matching user found for: '%s'" % user)
+        for found in users:
+            if found.get(id_name) == user:
+                return found.get(id_name)
+        return users[0].get(id_name)
+
+    def _get_user_id(self, user):
+        return self.run(self.get_user_id_async(user))
+
+    ########## 쓰기
+    async def add_watcher_async(self, issue, watcher):
+        await self.request('POST', 'issue/%s/watchers' % issue, data=json.dumps(watcher))
+
+    def add_watcher(self, issue, watcher):
+        self.run(self.add_watcher_async(issue, watcher))
+
+    # watcher는 _get_user_id로 찾은 사용자 ID
+    async def remove_watcher_async(self, issue, watcher):
+        if self.is_cloud():
+            params = {'accountId': watcher}
+        else:
+            params = {'username': watcher}
+        await self.request('DELETE', 'issue/%s/watchers' % issue, params=params)
+
+    def remove_watcher(self, issue, watcher):
+        self.run(self.remove_watcher_async(issue, watcher))
+
+    async def update_issue_async(self, key, fields, notify=True):
+        params = {}
+        if not notify:
+            params['notifyUsers'] = 'false'
+        await self.request('PUT', 'issue/' + str(key), params=params, data=json.dumps({'fields': fields}))
+
+    async def create_issue_async(self, fields):
+        data = (await self.request('POST', 'issue', data=json.dumps({'fields': make_create_fields(fields)}))).json()
+        return RawIssue(data)
+
+    def create_issue(self, fields=None, prefetch=False, **fieldargs):
+        if fields is None:
+            fields = fieldargs
+        return self.run(self.create_issue_async(fields))
+
+    async def create_issues_async(self, field_list):
+        data = {'issueUpdates': [{'fields': make_create_fields(fields)} for fields in field_list]}
+        try:
+            raw_issue_json = (await self.request('POST', 'issue/bulk', data=json.dumps(data))).json()
+        except JIRAError as err:
+            # 하나도 만들지 못한 경우 (jira.JIRA.create_issues와 같음)
+            if err.status_code != 400:
+                raise
+            raw_issue_json = json.loads(err.text)
+
+        errors = {}
+        for error in raw_issue_json.get('errors', []):
+            errors[error['failedElementNumber']] = error['elementErrors']['errors']
+        created = list(raw_issue_json.get('issues', []))
+        issue_list = []
+        for index, fields in enumerate(field_list):
+            if index in errors:
+                issue_list.append({'status': 'Error', 'error': errors[index], 'issue': None, 'input_fields': fields})
+            else:
+                issue_list.append({'status': 'Success', 'issue': RawIssue(created.pop(0)), 'error': None, 'input_fields': fields})
+        return issue_list
+
+    # jira.JIRA.create_issues와 같은 결과 (이슈는 키만 가진 RawIssue, prefetch는 하지 않음)
+    def create_issues(self, field_list, prefetch=False):
+        return self.run(self.create_issues_async(field_list))
+
+# 이름으로 준 project/issuetype을 REST API 형태로 바꿈
+def make_create_fields(fields):
+    fields = dict(fields)
+    if isinstance(fields.get('project'), str):
+        fields['project'] = {'key': fields['project']}
+    if isinstance(fields.get('issuetype'), str):
+        fields['issuetype'] = {'name': fields['issuetype']}
+    return fields
@@ -0,0 +1,572 @@
+# JIRA 자동화 도구 - 성능 측정 (실제 VLM 서버 없이 로컬 mock Jira 서버로 측정함)
+#
+# 사용법: python JIRA_automation_tool_benchmark.py [--sizes 1000 10000 50000] [--latency 0.02] [--throttle-rate 0.01]
+#                                                [--no-watcher-jql] [--workers 8] [--rps 50] [--json 결과.json]
+#
+# 크기마다 mock 서버(별도 프로세스)를 이슈 N개로 채운 뒤, 다음 기능을 차례대로 실행하고
+# 서버가 받은 요청 수, 걸린 시간, 최대 메모리 사용량(tracemalloc, 도구 쪽만)을 보여줌
+#   이슈 수집하기 -> 이슈 업데이트 -> 변경분 수집하기 -> 이슈 복사하고 제목 바꾸기 -> watcher 추가하기 -> watcher 제거하기
+#
+# mock 서버만 띄우려면: python JIRA_automation_tool_benchmark.py --serve --sizes 1000 (Ctrl+C로 끝냄)
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import functools
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import multiprocessing
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+########## 환경변수
+MOCK_HOST = '127.0.0.1'
+MOCK_PORT = 8765
+MOCK_PROJECT = 'HKMCCLUHUD'
+MOCK_USERS = 200                # 만들 사용자 수
+MOCK_CHILDREN_PER_PARENT = 9    # parent 이슈 하나에 달린 Sub-task 수
+BENCHMARK_QUERY = 'project in (HKMCCLUHUD) AND summary ~ ccIC24 AND summary ~ WBS3'
+BENCHMARK_UPDATE_RATIO = 10     # csv 파일에서 10줄에 1줄씩 업데이트 flag를 넣음
+MOCK_TIMEZONE = 'Etc/GMT+12'    # mock 사용자 프로필 시간대 (JQL 날짜 조건을 이 시간대로 해석함, 로컬 시간대와 다르게 둘 것)
+
+########## mock 데이터
+def mock_user(n):
+    return {'self': 'http://%s:%d/rest/api/2/user?username=user%d' % (MOCK_HOST, MOCK_PORT, n),
+            'name': 'user%d' % n, 'key': 'user%d' % n, 'displayName': '사용자%d user%d' % (n, n), 'active': True}
+
+# 없는 사용자 이름이 watcher로 추가된 경우에도 사용자 정보 형태로 돌려줌
+def mock_watcher(name):
+    match = re.match(r'user(\d+)$', name)
+    if match is None:
+        return {'self': 'http://%s:%d/rest/api/2/user?username=%s' % (MOCK_HOST, MOCK_PORT, name),
+                'name': name, 'key': name, 'displayName': name, 'active': True}
+    return mock_user(int(match.group(1)))
+
+# 실제 서버처럼 'self' 주소를 붙여야 jira 라이브러리가 Project, IssueType 같은 객체로 읽음 (str()이 이름이 됨)
+def mock_ref(kind, id, **values):
+    return dict(values, id=str(id), self='http://%s:%d/rest/api/2/%s/%s' % (MOCK_HOST, MOCK_PORT, kind, id))
+
+# 로컬 시간 -> Jira 날짜 문자열 (시간대 포함)
+def mock_datetime(value):
+    return value.astimezone().strftime('%Y-%m-%dT%H:%M:%S.000%z')
+
+# 이슈 N개 만들기: parent 하나 + Sub-task MOCK_CHILDREN_PER_PARENT개씩 묶음
+# 제목은 "[ccIC24][WBS3] Analysis 12" 형태이고, 일부는 다른 카테고리(WBS2)로 만들어서 쿼리 조건에서 빠지게 함
+def make_mock_issues(size, seed=0):
+    rng = random.Random(seed)
+    base_time = datetime(2023, 8, 1, 9, 0)
+    titles = ['Analysis', 'Design', 'Implementation', 'Test']
+    issues = []
+    parent_key = None
+    for n in range(1, size + 1):
+        key = '%s-%d' % (MOCK_PROJECT, n)
+        is_parent = (n - 1) % (MOCK_CHILDREN_PER_PARENT + 1) == 0
+        category = 'WBS2' if n % 20 == 0 else 'WBS3'
+        assignee = mock_user(rng.randrange(MOCK_USERS))
+        fields = {
+            'project': mock_ref('project', 10000, key=MOCK_PROJECT, name=MOCK_PROJECT),
+            'summary': '[ccIC24][%s] %s %d' % (category, titles[n % len(titles)], n),
+            'issuetype': mock_ref('issuetype', 1 if is_parent else 2, name='Task' if is_parent else 'Sub-task', subtask=not is_parent),
+            'priority': mock_ref('priority', n % 4 + 1, name='P%d' % (n % 4 + 1)),
+            'components': [mock_ref('component', n % 5, name='ES94111-%02d' % (n % 5))],
+            'labels': ['ccIC24_CLU_WBS'],
+            'customfield_43801': mock_ref('customFieldOption', 43801, value='ccIC24'),
+            'customfield_10104': mock_ref('customFieldOption', 10104, value='Comment'),
+            'status': mock_ref('status', 1, name='Open'),
+            'resolution': None,
+            'assignee': assignee,
+            'reporter': mock_user(0),
+            'duedate': '2023-08-30',
+            'created': mock_datetime(base_time + timedelta(minutes=n)),
+            'updated': mock_datetime(base_time + timedelta(minutes=n)),
+            'description': '설명 텍스트입니다 %d' % n,
+            'versions': [],
+            'fixVersions': [],
+        }
+        if is_parent:
+            parent_key = key
+        else:
+            fields['parent'] = {'key': parent_key, 'id': parent_key.split('-')[1]}
+        watchers = set([assignee['name']])
+        for i in range(rng.randrange(3)):
+            watchers.add('user%d' % rng.randrange(MOCK_USERS))
+        issues.append({'key': key, 'fields': fields, 'watchers': watchers})
+    return issues
+
+########## JQL (도구가 쓰는 만큼만: AND/OR/괄호, =, ~, >=, <, in (...), ORDER BY 필드 하나)
+JQL_TOKEN = re.compile(r'\s*(\(|\)|,|>=|<=|!=|=|~|<|>|"(?:[^"\\]|\\.)*"|[^\s(),=~<>!"]+)')
+
+class JqlError(Exception):
+    pass
+
+def tokenize_jql(jql):
+    position = jql.lower().rfind('order by')
+    if position != -1:
+        jql = jql[:position]
+    tokens = []
+    jql = jql.strip()
+    while jql:
+        match = JQL_TOKEN.match(jql)
+        if match is None:
+            raise JqlError("JQL을 읽을 수 없습니다: %s" % jql)
+        tokens.append(match.group(1))
+        jql = jql[match.end():].lstrip()
+    return tokens
+
+def jql_value(token):
+    if token.startswith('"'):
+        return re.sub(r'\\(.)', r'\1', token[1:-1])
+    return token
+
+# 토큰 목록 -> 이슈 하나를 받아서 True/False를 돌려주는 함수
+def parse_jql(tokens, unsupported_fields=()):
+    position = [0]
+
+    def peek():
+        return tokens[position[0]] if position[0] < len(tokens) else None
+
+    def take():
+        token = peek()
+        position[0] = position[0] + 1
+        return token
+
+    def parse_or():
+        terms = [parse_and()]
+        while peek() is not None and peek().upper() == 'OR':
+            take()
+            terms.append(parse_and())
+        return lambda issue: any(term(issue) for term in terms)
+
+    def parse_and():
+        factors = [parse_factor()]
+        while peek() is not None and peek().upper() == 'AND':
+            take()
+            factors.append(parse_factor())
+        return lambda issue: all(factor(issue) for factor in factors)
+
+    def parse_factor():
+        if peek() == '(':
+            take()
+            expression = parse_or()
+            if take() != ')':
+                raise JqlError("괄호가 맞지 않습니다.")
+            return expression
+        field = take().lower()
+        operator = take()
+        if operator is None:
+            raise JqlError("조건이 끝나지 않았습니다.")
+        if field in unsupported_fields:
+            raise JqlError("Field '%s' does not exist or you do not have permission to view it." % field)
+        if operator.lower() == 'in':
+            if take() != '(':
+                raise JqlError("in 뒤에는 괄호가 와야 합니다.")
+            values = set()
+            while peek() != ')':
+                token = take()
+                if token is None:
+                    raise JqlError("괄호가 맞지 않습니다.")
+                if token != ',':
+                    values.add(jql_value(token))
+            take()
+            return make_condition(field, 'in', values)
+        return make_condition(field, operator, jql_value(take()))
+
+    expression = parse_or()
+    if peek() is not None:
+        raise JqlError("JQL을 읽을 수 없습니다: %s" % ' '.join(tokens[position[0]:]))
+    return expression
+
+def make_condition(field, operator, value):
+    if field == 'project' and operator in ('=', 'in'):
+        values = value if operator == 'in' else set([value])
+        return lambda issue: issue['fields']['project']['key'] in values
+    if field in ('key', 'issuekey') and operator in ('=', 'in'):
+        values = value if operator == 'in' else set([value])
+        return lambda issue: issue['key'] in values
+    if field == 'summary' and operator == '~':
+        word = value.lower()
+        return lambda issue: word in issue['fields']['summary'].lower()
+    if field == 'watcher' and operator == '=':
+        return lambda issue: value in issue['watchers']
+    if field == 'assignee' and operator == '=':
+        return lambda issue: issue['fields']['assignee'] is not None and issue['fields']['assignee']['name'] == value
+    if field in ('updated', 'created') and operator in ('>=', '<'):
+        # JQL 날짜는 실제 서버처럼 사용자 프로필 시간대(MOCK_TIMEZONE)를 따름
+        since = datetime.strptime(value, '%Y/%m/%d %H:%M').replace(tzinfo=ZoneInfo(MOCK_TIMEZONE))
+        if operator == '<':
+            return lambda issue: mock_parse_datetime(issue['fields'][field]) < since
+        return lambda issue: mock_parse_datetime(issue['fields'][field]) >= since
+    raise JqlError("지원하지 않는 조건입니다: %s %s" % (field, operator))
+
+@functools.lru_cache(maxsize=None)
+def mock_parse_datetime(value):
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+
+# ORDER BY 절 -> (정렬 함수, 내림차순 여부) (없으면 키 순서)
+def jql_order(jql):
+    position = jql.lower().rfind('order by')
+    if position == -1:
+        return None, False
+    terms = jql[position + len('order by'):].split()
+    field = terms[0].lower()
+    descending = len(terms) > 1 and terms[1].upper() == 'DESC'
+    if field in ('key', 'issuekey'):
+        return None, descending
+    if field in ('created', 'updated'):
+        return lambda issue: mock_parse_datetime(issue['fields'][field]), descending
+    raise JqlError("지원하지 않는 정렬입니다: %s" % field)
+
+########## mock Jira 서버
+# fields는 "a,b" 한 개로 올 수도 있고 fields=a&fields=b처럼 여러 개로 올 수도 있음
+def requested_fields(params):
+    if 'fields' not in params:
+        return None
+    return ','.join(params['fields'])
+
+class MockJira:
+    def __init__(self, size, latency=0.0, throttle_rate=0.0, unsupported_fields=(), seed=0):
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.unsupported_fields = unsupported_fields
+        self.random = random.Random(seed)
+        self.issues = {}
+        self.order = []
+        for issue in make_mock_issues(size, seed):
+            self.issues[issue['key']] = issue
+            self.order.append(issue['key'])
+        self.next_number = size + 1
+        self.version = 0            # 이슈가 바뀔 때마다 늘려서 검색 결과 캐시를 버림
+        self.search_cache = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = {}
+            self.throttled = 0
+
+    def stats(self):
+        with self.lock:
+            return {'requests': dict(self.requests), 'total': sum(self.requests.values()), 'throttled': self.throttled}
+
+    def count(self, name):
+        with self.lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+
+    # 요청 하나를 처리함 -> (상태 코드, JSON 값, 추가 헤더)
+    def handle(self, method, path, params, body):
+        if path.startswith('/_mock/'):
+            if method == 'DELETE':
+                self.reset_stats()
+                return 204, None, {}
+            return 200, self.stats(), {}
+
+        path = path.split('/rest/api/2/', 1)[-1]
+        name = method + ' ' + re.sub(r'^issue/(?!bulk$)[^/]+', 'issue/{key}', path)
+        self.count(name)
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if self.throttle_rate > 0:
+            with self.lock:
+                throttled = self.random.random() < self.throttle_rate
+                if throttled:
+                    self.throttled = self.throttled + 1
+            if throttled:
+                return 429, {'errorMessages': ['Rate limit exceeded']}, {'Retry-After': '1'}
+
+        if path == 'serverInfo':
+            return 200, {'baseUrl': 'http://%s:%d' % (MOCK_HOST, MOCK_PORT), 'version': '8.20.0', 'versionNumbers': [8, 20, 0],
+                         'deploymentType': 'Server', 'buildNumber': 820000, 'serverTitle': 'Mock Jira'}, {}
+        if path == 'field':
+            return 200, [{'id': 'summary', 'name': 'Summary', 'custom': False, 'clauseNames': ['summary']},
+                         {'id': 'customfield_43801', 'name': 'HMC프로젝트', 'custom': True, 'clauseNames': ['cf[43801]', 'HMC프로젝트']},
+                         {'id': 'customfield_10104', 'name': 'Severity', 'custom': True, 'clauseNames': ['cf[10104]', 'Severity']}], {}
+        if path == 'myself':
+            return 200, dict(mock_user(0), timeZone=MOCK_TIMEZONE), {}
+        if path == 'user/search':
+            name = (params.get('username') or params.get('query') or [''])[0]
+            match = re.match(r'user(\d+)$', name)
+            if match is None or int(match.group(1)) >= MOCK_USERS:
+                return 200, [], {}
+            return 200, [mock_user(int(match.group(1)))], {}
+        if path == 'search':
+            return self.search(params)
+        if path == 'issue' and method == 'POST':
+            return 201, self.create_issue(json.loads(body)['fields']), {}
+        if path == 'issue/bulk' and method == 'POST':
+            return 201, {'issues': [self.create_issue(update['fields']) for update in json.loads(body)['issueUpdates']], 'errors': []}, {}
+
+        match = re.match(r'^issue/([^/]+)(/watchers)?$', path)
+        if match is None:
+            return 404, {'errorMessages': ['Not found: ' + path]}, {}
+        with self.lock:
+            issue = self.issues.get(match.group(1))
+        if issue is None:
+            return 404, {'errorMessages': ['Issue Does Not Exist']}, {}
+        if match.group(2) is None:
+            if method == 'GET':
+                return 200, self.issue_json(issue, requested_fields(params)), {}
+            if method == 'PUT':
+                self.update_issue(issue, json.loads(body)['fields'])
+                return 204, None, {}
+        else:
+            if method == 'GET':
+                with self.lock:
+                    watchers = sorted(issue['watchers'])
+                return 200, {'isWatching': False, 'watchCount': len(watchers), 'watchers': [mock_watcher(watcher) for watcher in watchers]}, {}
+            if method == 'POST':
+                with self.lock:
+                    issue['watchers'].add(json.loads(body))
+                return 204, None, {}
+            if method == 'DELETE':
+                with self.lock:
+                    issue['watchers'].discard(params.get('username', [''])[0])
+                return 204, None, {}
+        return 405, {'errorMessages': ['Method not allowed']}, {}
+
+    def issue_json(self, issue, fields=None):
+        with self.lock:
+            if fields is None or fields in ('*all', '*navigable'):
+                selected = dict(issue['fields'])
+            else:
+                selected = {}
+                for name in fields.split(','):
+                    if name in issue['fields']:
+                        selected[name] = issue['fields'][name]
+            return {'id': issue['key'].split('-')[1], 'key': issue['key'],
+                    'self': 'http://%s:%d/rest/api/2/issue/%s' % (MOCK_HOST, MOCK_PORT, issue['key']), 'fields': selected}
+
+    def search(self, params):
+        jql = params.get('jql', [''])[0]
+        start_at = int(params.get('startAt', ['0'])[0])
+        max_results = min(int(params.get('maxResults', ['50'])[0]), 1000)
+        fields = requested_fields(params)
+        with self.lock:
+            cached = self.search_cache.get(jql)
+            version = self.version
+        if cached is None or cached[0] != version:
+            try:
+                condition = parse_jql(tokenize_jql(jql), self.unsupported_fields) if jql.strip() else (lambda issue: True)
+                order, descending = jql_order(jql)
+            except JqlError as err:
+                return 400, {'errorMessages': [str(err)], 'errors': {}}, {}
+            with self.lock:
+                keys = [key for key in self.order if condition(self.issues[key])]
+                if order is not None:
+                    keys.sort(key=lambda key: order(self.issues[key]))
+                if descending:
+                    keys.reverse()
+                self.search_cache[jql] = (version, keys)
+        else:
+            keys = cached[1]
+        issues = [self.issue_json(self.issues[key], fields) for key in keys[start_at:start_at + max_results]]
+        return 200, {'startAt': start_at, 'maxResults': max_results, 'total': len(keys), 'issues': issues}, {}
+
+    def create_issue(self, fields):
+        with self.lock:
+            key = '%s-%d' % (fields['project'].get('key', MOCK_PROJECT), self.next_number)
+            self.next_number = self.next_number + 1
+            fields = dict(fields)
+            fields['project'] = mock_ref('project', 10000, key=fields['project'].get('key', MOCK_PROJECT), name=MOCK_PROJECT)
+            fields['status'] = mock_ref('status', 1, name='Open')
+            fields['resolution'] = None
+            fields['reporter'] = mock_user(0)
+            fields['created'] = fields['updated'] = mock_datetime(datetime.now())
+            if 'assignee' in fields and fields['assignee'] is not None:
+                fields['assignee'] = mock_watcher(fields['assignee']['name'])
+            self.issues[key] = {'key': key, 'fields': fields, 'watchers': set()}
+            self.order.append(key)
+            self.version = self.version + 1
+        return {'id': key.split('-')[1], 'key': key, 'self': 'http://%s:%d/rest/api/2/issue/%s' % (MOCK_HOST, MOCK_PORT, key)}
+
+    def update_issue(self, issue, fields):
+        with self.lock:
+            for name, value in fields.items():
+                if name == 'assignee' and value is not None:
+                    value = mock_watcher(value['name'])
+                issue['fields'][name] = value
+            issue['fields']['updated'] = mock_datetime(datetime.now())
+            self.version = self.version + 1
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_request(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length > 0 else None
+        status, value, headers = self.server.mock.handle(self.command, url.path, parse_qs(url.query), body)
+        data = b'' if value is None else json.dumps(value, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, header in headers.items():
+            self.send_header(name, header)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_request
+    do_POST = do_request
+    do_PUT = do_request
+    do_DELETE = do_request
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_mock_jira(size, latency=0.0, throttle_rate=0.0, unsupported_fields=(), port=MOCK_PORT):
+    server = ThreadingHTTPServer((MOCK_HOST, port), MockRequestHandler)
+    server.daemon_threads = True
+    server.mock = MockJira(size, latency, throttle_rate, unsupported_fields)
+    server.serve_forever()
+
+# mock 서버를 별도 프로세스로 띄움 (도구 쪽 메모리 측정에 서버가 섞이지 않도록)
+def start_mock_jira(size, latency=0.0, throttle_rate=0.0, unsupported_fields=(), port=MOCK_PORT):
+    import requests
+    process = multiprocessing.Process(target=serve_mock_jira, args=(size, latency, throttle_rate, unsupported_fields, port), daemon=True)
+    process.start()
+    url = 'http://%s:%d' % (MOCK_HOST, port)
+    for i in range(300):
+        try:
+            requests.get(url + '/_mock/stats', timeout=1)
+            return process, url
+        except (requests.ConnectionError, requests.Timeout):
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("mock Jira 서버를 시작하지 못했습니다.")
+
+########## 성능 측정
+def mock_stats(url, reset=False):
+    import requests
+    if reset:
+        requests.delete(url + '/_mock/stats')
+        return None
+    return requests.get(url + '/_mock/stats').json()
+
+# 기능 하나를 실행하고 요청 수, 걸린 시간, 최대 메모리 사용량을 잼
+def measure(url, name, function, *args, **kwargs):
+    mock_stats(url, reset=True)
+    tracemalloc.start()
+    started = time.perf_counter()
+    error = None
+    try:
+        function(*args, **kwargs)
+    except Exception as err:
+        error = '{}'.format(err)
+    wall_time = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = mock_stats(url)
+    return {'name': name, 'wall_seconds': wall_time, 'requests': stats['total'], 'throttled': stats['throttled'],
+            'requests_by_endpoint': stats['requests'], 'peak_memory_mb': peak / (1024 * 1024), 'error': error}
+
+# 수집한 csv 파일에서 BENCHMARK_UPDATE_RATIO줄에 1줄씩 업데이트 flag를 넣고 제목을 바꿈 (flag를 넣은 줄 수를 돌려줌)
+def mark_csv_for_update(filename_to_read, filename_to_write):
+    count = 0
+    with open(filename_to_read, 'r', encoding='euc-kr', newline='') as data_to_read, open(filename_to_write, 'w', encoding='euc-kr', newline='') as data_to_write:
+        csvwriter = csv.writer(data_to_write, delimiter=',')
+        for seq, line in enumerate(csv.reader(data_to_read)):
+            if seq > 0 and seq % BENCHMARK_UPDATE_RATIO == 0:
+                line[0] = 'u'
+                line[3] = line[3] + ' (updated)'
+                count = count + 1
+            csvwriter.writerow(line)
+    return count
+
+# 이슈 업데이트를 시작한 시각을 마지막 수집 시각으로 두고 변경분을 수집해서, 업데이트한 이슈 expected개를 모두 찾는지 확인함
+# mock 서버의 프로필 시간대(MOCK_TIMEZONE)가 로컬 시간대와 다르므로 JQL 날짜 조건을 다른 시간대로 만들면 여기서 실패함
+def collect_updated_issues(common, jira, filename, update_started, expected, workers, store):
+    common.save_watermark(filename, BENCHMARK_QUERY, mock_datetime(update_started))
+    count = common.export_updated_issues_csv(jira, BENCHMARK_QUERY, filename, False, workers, store, formats=['csv'])
+    if count < expected:
+        raise RuntimeError("변경분 수집하기가 업데이트한 이슈 %d개 중 %d개만 찾았습니다." % (expected, count))
+
+def run_benchmark(size, args):
+    from jira import JIRA
+    import JIRA_automation_tool_common as common
+
+    process, url = start_mock_jira(size, args.latency, args.throttle_rate, ('watcher',) if args.no_watcher_jql else ())
+    workdir = tempfile.mkdtemp(prefix='jira_benchmark_')
+    results = []
+    try:
+        jira = JIRA(server=url, basic_auth=('user0', 'password'))
+        jira = common.open_transport(jira, url, 'user0', 'password')
+        store = common.IssueStore(os.path.join(workdir, common.ISSUE_STORE_FILENAME))
+        users = common.UserResolver(jira, os.path.join(workdir, common.USER_CACHE_FILENAME))
+        common.load_field_ids(jira, os.path.join(workdir, common.FIELD_CACHE_FILENAME))
+        common.JOURNAL_DIR = os.path.join(workdir, 'journal')
+        # mock 서버는 빠르게 보내도 되므로 --rps까지 올릴 수 있게 상한을 높임
+        common.THROTTLE_MAX_REQUESTS_PER_SECOND = max(common.THROTTLE_MAX_REQUESTS_PER_SECOND, args.rps)
+        filename = os.path.join(workdir, 'issues.csv')
+        update_filename = os.path.join(workdir, 'issues_update.csv')
+
+        # 기능마다 콘솔 출력이 많으므로 측정하는 동안은 출력하지 않음
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+        try:
+            # 이슈 업데이트 측정에 csv 파일이 필요하므로 csv는 항상 만듦
+            formats = ['csv'] + [export_format for export_format in args.export_formats if export_format != 'csv']
+            results.append(measure(url, 'collect_all_issues', common.export_issues_csv, jira, BENCHMARK_QUERY, filename, args.workers, store, formats=formats))
+            update_count = mark_csv_for_update(filename, update_filename)
+            update_started = datetime.now()
+            results.append(measure(url, 'update_all_issues', common.update_issues_from_csv, jira, store, users, update_filename, args.workers, args.rps))
+            results.append(measure(url, 'collect_updated_issues', collect_updated_issues, common, jira, filename, update_started, update_count, args.workers, store))
+            results.append(measure(url, 'custom_issue_cloning_and_renaming', common.clone_and_rename_issues, jira, store, users, BENCHMARK_QUERY, 'Analysis', 'SyRS', '2023-08-31', args.workers, args.rps))
+            results.append(measure(url, 'add_watchers_of_specific_person', common.add_watchers_to_issues_involving, jira, store, users, BENCHMARK_QUERY, 'user1', ['user2', 'user3'], args.workers, args.rps))
+            results.append(measure(url, 'del_watcher_from_all_issues', common.remove_watcher_from_issues, jira, store, users, BENCHMARK_QUERY, 'user2', args.workers, args.rps))
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        store.close()
+        jira.close()
+    finally:
+        process.terminate()
+        process.join()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def print_results(size, results):
+    print("=" * 100)
+    print("이슈 %d개" % size)
+    print("  %-36s %10s %10s %8s %12s" % ('기능', '시간(초)', '요청 수', '429', '최대 메모리(MB)'))
+    for result in results:
+        print("  %-36s %10.2f %10d %8d %12.1f" % (result['name'], result['wall_seconds'], result['requests'], result['throttled'], result['peak_memory_mb']))
+        if result['error'] is not None:
+            print("    실패: %s" % result['error'])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='mock Jira 서버로 JIRA 자동화 도구의 성능을 잼')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='이슈 수 (여러 개 가능)')
+    parser.add_argument('--latency', type=float, default=0.0, help='요청마다 서버가 기다릴 초')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='429 응답을 보낼 확률 (0~1)')
+    parser.add_argument('--no-watcher-jql', action='store_true', help='JQL watcher 조건을 쓸 수 없는 서버처럼 동작함')
+    parser.add_argument('--workers', type=int, default=8, help='동시 작업 수')
+    parser.add_argument('--rps', type=float, default=50.0, help='쓰기 작업의 최대 초당 요청 수')
+    parser.add_argument('--export-formats', nargs='+', default=['csv'], help='이슈 수집하기에서 함께 만들 형식 (csv utf8_csv jsonl sqlite parquet)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 이름')
+    parser.add_argument('--serve', action='store_true', help='측정하지 않고 mock 서버만 띄움 (첫 번째 크기로)')
+    args = parser.parse_args()
+
+    if args.serve:
+        print("mock Jira 서버: http://%s:%d (이슈 %d개)" % (MOCK_HOST, MOCK_PORT, args.sizes[0]))
+        serve_mock_jira(args.sizes[0], args.latency, args.throttle_rate, ('watcher',) if args.no_watcher_jql else ())
+        sys.exit()
+
+    all_results = {}
+    for size in args.sizes:
+        results = run_benchmark(size, args)
+        print_results(size, results)
+        all_results[str(size)] = results
+    print("=" * 100)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as data_to_write:
+            json.dump(all_results, data_to_write, ensure_ascii=False, indent=2)
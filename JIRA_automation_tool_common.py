@@ -0,0 +1,2002 @@
+# JIRA 자동화 도구 공통 기능
+# JIRA_automation_tool.py (tkinter 버전)과 JIRA_automation_tool_qt.py (Qt 버전)에서 함께 사용함
+
+import os
+import re
+import sys
+import csv
+import gzip
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import contextvars
+from bisect import bisect_left
+from contextlib import contextmanager
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from requests.adapters import HTTPAdapter
+from jira import JIRAError
+
+########## 환경변수
+SEARCH_PAGE_SIZE = 100      # 한 번에 가져올 이슈 수 (서버 설정 jira.search.views.default.max 이하로 할 것)
+WATCHER_FETCH_WORKERS = 8   # watcher 목록을 동시에 가져올 작업 수 (1이면 한 개씩 차례대로 가져옴)
+WATERMARK_OVERLAP_MINUTES = 5   # 변경분 수집 시 마지막 수집 시각보다 이만큼 앞에서부터 다시 가져옴 (시계/시간대 오차 대비)
+ISSUE_STORE_FILENAME = 'issue_store.db'     # 로컬 이슈 저장소 (SQLite) 파일 이름
+KEY_LOOKUP_CHUNK_SIZE = 100     # key in (...) 검색 한 번에 넣을 키 수
+WRITE_WORKERS = 4                   # 서버에 쓰기 작업을 동시에 보낼 작업 수
+WRITE_REQUESTS_PER_SECOND = 1.0     # 쓰기 작업 전체가 1초에 보낼 최대 요청 수 (서버 응답에 따라 이 값 이하로 자동으로 조절됨)
+USER_CACHE_FILENAME = 'user_cache.json'    # 사용자 이름 -> 사용자 ID 캐시 파일 이름
+USER_CACHE_SIZE = 1024                      # 캐시에 기억해 둘 최대 사용자 수 (오래 안 쓴 사용자부터 지움)
+USER_CACHE_TTL_SECONDS = 7 * 24 * 3600      # 캐시에 기억해 둔 사용자 ID를 다시 확인하기까지의 시간
+FIELD_CACHE_FILENAME = 'field_cache.json'  # 커스텀 필드 이름 -> 필드 ID 캐시 파일 이름 (서버별로 저장)
+CLONE_BATCH_SIZE = 50               # 이슈 복사 시 한 번의 요청으로 만들 이슈 수 (서버 설정 jira.bulk.create.max.issues.per.request 이하)
+THROTTLE_MIN_REQUESTS_PER_SECOND = 0.1      # 자동 조절할 때 가장 느린 요청 속도
+THROTTLE_MAX_REQUESTS_PER_SECOND = 10.0     # 쓰기 요청 속도의 상한 (초당 요청 수를 이보다 크게 정해도 이 속도까지만 보냄)
+THROTTLE_TARGET_LATENCY_SECONDS = 1.0       # 응답 시간이 이보다 짧으면 조금씩 빠르게, 길면 조금 느리게 함
+THROTTLE_INCREASE_STEP = 0.05               # 정상 응답 하나마다 늘리는 요청 속도 (덧셈)
+THROTTLE_DECREASE_FACTOR = 0.5              # 429/503 응답을 받으면 요청 속도에 곱하는 값 (곱셈)
+USE_ASYNC_TRANSPORT = False                 # True면 asyncio 전송 계층(JIRA_automation_tool_async.py, aiohttp 필요)으로 요청을 보냄
+
+PROGRESS_INTERVAL_SECONDS = 0.2             # 진행 상황을 알려주는 최소 간격 초
+REQUEST_STATS_FILENAME = 'request_stats.json'   # 작업별 요청 통계를 쌓아 둘 파일 이름
+REQUEST_STATS_HISTORY = 100                     # 요청 통계 파일에 남겨 둘 최근 작업 수
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'journal')   # 오래 걸리는 작업의 진행 기록을 둘 폴더
+SEARCH_PARTITION_WORKERS = 4                # 결과가 많은 쿼리를 나눠서 동시에 검색할 작업 수 (1이면 나누지 않음)
+SEARCH_PARTITION_MIN_ISSUES = 2000          # 결과가 이보다 많을 때만 나눠서 검색함
+SEARCH_PARTITION_SIZE = 2000                # 나눈 검색 하나의 최대 목표 이슈 수 (created 기간을 이 크기 이하가 되도록 나눔)
+QUERY_CACHE_TTL_SECONDS = 300               # 검색 결과 캐시를 다시 쓸 수 있는 시간 (query_cache를 켠 경우)
+QUERY_CACHE_MAX_ISSUES = 100000             # 검색 결과 캐시에 둘 최대 이슈 수 (오래 안 쓴 쿼리부터 지움)
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]   # 응답 시간 분포 구간 (초 이하, 마지막 구간은 그보다 긴 응답)
+EXPORT_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), '[HKMCCLUHUD][ccIC24] issues.csv')   # 이슈 수집하기/업데이트 csv 파일 (다른 형식은 확장자만 바꿔서 만듦)
+EXPORT_FORMATS = ['csv']    # 이슈 수집하기에서 함께 만들 형식: csv(EUC-KR, 이슈 업데이트가 읽음), utf8_csv, jsonl(gzip), sqlite, parquet(pyarrow 필요)
+EXPORT_PARQUET_ROW_GROUP_SIZE = 10000       # parquet 파일에 한 번에 모아서 쓸 이슈 수
+
+CSV_HEADER = ['update', 'key*', 'project*', 'summary', 'issuetype', 'priority', 'components', 'labels', 'HMC프로젝트', 'status*', 'resolution*', 'assignee', 'reporter*', 'watchers', 'duedate', 'created*', 'description']
+
+########## 필드
+# 도구에서 쓰는 커스텀 필드 이름과 기본 ID (서버에서 이름으로 찾지 못하면 기본 ID를 씀)
+HMC_PROJECT_FIELD = 'HMC프로젝트'
+SEVERITY_FIELD = 'Severity'
+CUSTOM_FIELD_DEFAULT_IDS = {
+    HMC_PROJECT_FIELD: 'customfield_43801',
+    SEVERITY_FIELD: 'customfield_10104',
+}
+
+# 커스텀 필드 이름 -> 필드 ID (load_field_ids로 서버의 값으로 바꿈)
+field_ids = dict(CUSTOM_FIELD_DEFAULT_IDS)
+
+def field_id(name):
+    return field_ids.get(name, name)
+
+# 커스텀 필드 ID를 이름으로 찾아서 field_ids에 넣음 (로그인한 뒤 한 번 부를 것)
+# 찾은 ID는 filename에 서버별로 저장해 두고, 모두 저장되어 있으면 서버에 묻지 않음
+def load_field_ids(jira, filename=None):
+    server = jira.client_info()
+    cache = {}
+    if filename is not None:
+        try:
+            with open(filename, 'r', encoding='utf-8') as data_to_read:
+                cache = json.load(data_to_read)
+        except (OSError, ValueError):
+            cache = {}
+
+    found = cache.get(server, {})
+    if any(name not in found for name in CUSTOM_FIELD_DEFAULT_IDS):
+        found = {}
+        for field in jira.fields():
+            if field['name'] in CUSTOM_FIELD_DEFAULT_IDS and field['name'] not in found:
+                found[field['name']] = field['id']
+        for name, default_id in CUSTOM_FIELD_DEFAULT_IDS.items():
+            if name not in found:
+                print("  커스텀 필드 '%s'를 찾을 수 없어서 기본 ID(%s)를 씁니다." % (name, default_id))
+                found[name] = default_id
+        cache[server] = found
+        if filename is not None:
+            with open(filename, 'w', encoding='utf-8') as data_to_write:
+                json.dump(cache, data_to_write, ensure_ascii=False)
+    field_ids.update(found)
+
+# 이슈 수집/로컬 이슈 저장소에 필요한 필드만 가져옴 (기본값 *all보다 응답이 훨씬 작음)
+def export_fields():
+    return ['parent', 'project', 'summary', 'issuetype', 'priority', 'components', 'labels', field_id(HMC_PROJECT_FIELD),
+            'status', 'resolution', 'assignee', 'reporter', 'duedate', 'created', 'updated', 'description']
+
+########## 이슈 레코드
+# jira Issue 객체는 응답 JSON 전체와 필드마다 Resource 객체를 들고 있어서 이슈가 많으면 메모리를 많이 씀
+# 일괄 작업은 검색 결과 JSON에서 도구가 쓰는 필드만 꺼낸 IssueRecord를 씀 (__slots__, 필드는 문자열)
+# 같은 값이 반복되는 문자열(프로젝트, 상태, 우선순위, 컴포넌트, 레이블, 사용자 등)은 sys.intern으로 한 벌만 둠
+
+# jira Resource의 str()과 같은 순서로 읽을 수 있는 이름을 찾음 (예: 사용자는 displayName, 프로젝트는 key)
+READABLE_KEYS = ['displayName', 'key', 'name', 'accountId', 'filename', 'value', 'scope', 'votes', 'id', 'mimeType', 'closed']
+
+def readable_name(raw):
+    if raw is None:
+        return None
+    if not isinstance(raw, dict):
+        return sys.intern(str(raw))
+    for name in READABLE_KEYS:
+        if name in raw:
+            value = str(raw[name])
+            # 연결된 선택 목록 (cascading select)
+            if 'child' in raw:
+                value = value + ' - ' + readable_name(raw['child'])
+            return sys.intern(value)
+    return sys.intern(str(raw))
+
+class IssueRecord:
+    __slots__ = ('key', 'parent_key', 'project', 'summary', 'issuetype', 'priority', 'components', 'labels', 'hmc_project',
+                 'status', 'resolution', 'assignee', 'reporter', 'duedate', 'created', 'updated', 'description')
+
+    # raw: 검색 결과 JSON의 이슈 하나 (요청하지 않은 필드는 None)
+    def __init__(self, raw):
+        fields = raw.get('fields') or {}
+        parent = fields.get('parent')
+        self.key = raw['key']
+        self.parent_key = None if parent is None else parent.get('key')
+        self.project = readable_name(fields.get('project'))
+        self.summary = fields.get('summary')
+        self.issuetype = readable_name(fields.get('issuetype'))
+        self.priority = readable_name(fields.get('priority'))
+        self.components = tuple(sys.intern(component['name']) for component in fields.get('components') or [])
+        self.labels = tuple(sys.intern(label) for label in fields.get('labels') or [])
+        self.hmc_project = readable_name(fields.get(field_id(HMC_PROJECT_FIELD)))
+        self.status = readable_name(fields.get('status'))
+        self.resolution = readable_name(fields.get('resolution'))
+        self.assignee = readable_name(fields.get('assignee'))
+        self.reporter = readable_name(fields.get('reporter'))
+        self.duedate = fields.get('duedate')
+        self.created = fields.get('created')
+        self.updated = fields.get('updated')
+        self.description = fields.get('description')
+
+    # jira.watchers(issue) 등에 이슈 대신 넘길 수 있도록 키를 돌려줌
+    def __str__(self):
+        return self.key
+
+# 검색 결과 한 페이지 (jira ResultList처럼 전체 이슈 수를 total로 가짐)
+class IssueRecordList(list):
+    def __init__(self, records, total):
+        list.__init__(self, records)
+        self.total = total
+
+########## 검색 결과 캐시
+# 같은 쿼리로 미리 보기 -> 수집하기 -> watcher 작업처럼 이어서 실행할 때 이미 가져온 페이지를 다시 씀
+# 키는 공백을 정리한 JQL과 필드 목록이고, 쿼리마다 앞에서부터 이어서 가져온 이슈를 모아 둠
+# 필드가 더 많은 캐시로도 답할 수 있음 (예: 수집하기로 가져온 결과로 이슈 목록 보기)
+# TTL이 지나면 다시 가져오고, 이슈 수가 max_issues를 넘으면 오래 안 쓴 쿼리부터 지우며,
+# 도구가 서버에 쓰기를 하면 (쓰기 작업 실행기가 끝날 때) 모두 지움
+class QueryCache:
+    def __init__(self, ttl=QUERY_CACHE_TTL_SECONDS, max_issues=QUERY_CACHE_MAX_ISSUES):
+        self.ttl = ttl
+        self.max_issues = max_issues
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()    # (JQL, 필드) -> {'issues': 앞에서부터 가져온 이슈, 'total': 전체 수, 'expires_at': 만료 시각}
+        self.issue_count = 0
+        self.hit_count = 0
+        self.miss_count = 0
+
+    @staticmethod
+    def make_key(query, fields):
+        return (' '.join(query.split()), None if fields is None else frozenset(fields))
+
+    # 캐시에서 한 페이지를 찾음 (없으면 None)
+    def get(self, query, fields, start_at, page_size):
+        query_key, field_key = self.make_key(query, fields)
+        now = time.time()
+        with self.lock:
+            for key in list(self.entries):
+                entry = self.entries[key]
+                if entry['expires_at'] <= now:
+                    self.remove(key)
+                    continue
+                if key[0] != query_key or not (key[1] is None or (field_key is not None and field_key <= key[1])):
+                    continue
+                issues = entry['issues']
+                if start_at + page_size <= len(issues) or (len(issues) >= entry['total'] and start_at <= len(issues)):
+                    self.entries.move_to_end(key)
+                    self.hit_count = self.hit_count + 1
+                    return IssueRecordList(issues[start_at:start_at + page_size], entry['total'])
+            self.miss_count = self.miss_count + 1
+        return None
+
+    # 서버에서 가져온 페이지를 넣음 (앞 페이지에 바로 이어지는 페이지만 모아 둠)
+    def put(self, query, fields, start_at, issues):
+        key = self.make_key(query, fields)
+        with self.lock:
+            entry = self.entries.get(key)
+            if start_at == 0:
+                if entry is not None:
+                    self.remove(key)
+                entry = {'issues': [], 'total': issues.total, 'expires_at': time.time() + self.ttl}
+                self.entries[key] = entry
+            elif entry is None or start_at != len(entry['issues']):
+                return
+            entry['issues'].extend(issues)
+            entry['total'] = issues.total
+            self.entries.move_to_end(key)
+            self.issue_count = self.issue_count + len(issues)
+            while self.issue_count > self.max_issues and len(self.entries) > 0:
+                self.remove(next(iter(self.entries)))
+
+    def remove(self, key):
+        entry = self.entries.pop(key)
+        self.issue_count = self.issue_count - len(entry['issues'])
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.issue_count = 0
+
+# 검색 결과 캐시 (None이면 쓰지 않음, Qt 버전은 로그인할 때 켬)
+query_cache = None
+
+# 도구가 서버에 쓰기를 한 뒤에 부름 (캐시된 검색 결과가 달라졌을 수 있음)
+def invalidate_query_cache():
+    if query_cache is not None:
+        query_cache.clear()
+
+# 검색 한 번을 JSON으로 받아서 IssueRecord 목록으로 바꿈 (jira Issue 객체를 만들지 않음)
+def search_issue_records(jira, query, start_at, page_size, **options):
+    fields = options.get('fields')
+    if fields is not None:
+        fields = list(fields)       # jira 라이브러리가 넘긴 목록을 바꿀 수 있으므로 키는 복사본으로 만듦
+    cache = query_cache
+    if cache is not None:
+        issues = cache.get(query, fields, start_at, page_size)
+        if issues is not None:
+            return issues
+
+    data = jira.search_issues(query, startAt=start_at, maxResults=page_size, json_result=True, **options)
+    issues = IssueRecordList([IssueRecord(raw) for raw in data['issues']], data['total'])
+    if cache is not None:
+        cache.put(query, fields, start_at, issues)
+    return issues
+
+########## 이슈 검색
+# 쿼리에 조건을 AND로 덧붙임 (ORDER BY 절은 맨 뒤에 그대로 둠)
+def add_jql_condition(query, condition):
+    order_by = ''
+    position = query.lower().rfind('order by')
+    if position != -1:
+        order_by = ' ' + query[position:]
+        query = query[:position].rstrip()
+    return "(%s) AND %s%s" % (query, condition, order_by)
+
+# 페이지를 넘기는 도중 순서가 바뀌지 않도록 정렬 조건을 고정함
+def ordered_query(query):
+    if 'order by' not in query.lower():
+        query = query + ' ORDER BY key ASC'
+    return query
+
+# 쿼리 결과 중 start_at번째부터 한 페이지만 가져옴 (화면에 보이는 만큼만 가져올 때)
+def search_issue_page(jira, query, start_at, page_size=SEARCH_PAGE_SIZE, fields=None):
+    return search_issue_records(jira, ordered_query(query), start_at, page_size, fields=fields)
+
+# 쿼리 결과를 페이지(startAt/maxResults) 단위로 하나씩 돌려줌 (IssueRecord 목록)
+# 전체 결과를 한 번에 메모리에 올리지 않으므로 이슈 수와 상관없이 메모리 사용량이 일정함
+# validate_query가 False이면 쿼리에 없는 키가 있어도 오류 대신 경고만 받음
+def iter_issue_pages(jira, query, page_size=SEARCH_PAGE_SIZE, fields=None, validate_query=True):
+    return iter_issue_pages_from(jira, query, 0, page_size, fields, validate_query)
+
+# 쿼리 결과 중 start_at번째부터 페이지 단위로 돌려줌
+def iter_issue_pages_from(jira, query, start_at, page_size=SEARCH_PAGE_SIZE, fields=None, validate_query=True):
+    query = ordered_query(query)
+
+    options = {}
+    if fields is not None:
+        options['fields'] = fields
+    if not validate_query:
+        options['validate_query'] = False
+
+    while True:
+        issues = search_issue_records(jira, query, start_at, page_size, **options)
+        if len(issues) == 0:
+            break
+        yield issues
+        start_at = start_at + len(issues)
+        if start_at >= issues.total:
+            break
+
+# 쿼리 결과를 이슈 하나씩 돌려줌
+def iter_issues(jira, query, page_size=SEARCH_PAGE_SIZE, fields=None, validate_query=True):
+    for issues in iter_issue_pages(jira, query, page_size, fields, validate_query):
+        for issue in issues:
+            yield issue
+
+########## 나눠서 동시에 검색하기
+# 결과가 많은 쿼리는 한 페이지씩 차례대로 가져오는 것이 가장 오래 걸리므로,
+# 쿼리를 겹치지 않는 여러 쿼리로 나눠서 (project in (...)의 프로젝트별, created 기간별) 동시에 가져오고
+# 나눈 순서대로 이어 붙여서 (중복은 빼고) 한 쿼리의 결과처럼 페이지 단위로 돌려줌
+# 프로젝트 안에서는 키 번호가 만든 순서이므로, created 기간 순서로 이어 붙이면 키 순서와 같음
+
+# 따옴표 안의 문자열을 공백으로 가린 쿼리 (위치는 그대로)
+def mask_jql_strings(query):
+    return re.sub(r'"(?:[^"\\]|\\.)*"', lambda match: '"' + ' ' * (len(match.group(0)) - 2) + '"', query)
+
+# 나눠서 가져온 결과를 키 순서로 합칠 수 있는 쿼리인지 (정렬 조건이 없거나 키 순서일 때만)
+def can_partition_query(query):
+    order_by = re.search(r'\border\s+by\s+(.*)$', mask_jql_strings(query), re.IGNORECASE)
+    if order_by is None:
+        return True
+    return re.match(r'(issue)?key(\s+asc)?\s*$', order_by.group(1).strip(), re.IGNORECASE) is not None
+
+# project in (A, B, C) -> 프로젝트마다 project = A인 쿼리 (나눌 수 없으면 [query])
+# OR/NOT이 있으면 project in이 전체 조건에 AND로 걸려 있는지 알 수 없으므로 나누지 않음
+def split_query_by_project(query):
+    masked = mask_jql_strings(query)
+    match = re.search(r'\bproject\s+in\s*\(([^)]*)\)', masked, re.IGNORECASE)
+    if match is None or re.search(r'\b(or|not)\b', masked, re.IGNORECASE) is not None:
+        return [query]
+    projects = [project.strip() for project in query[match.start(1):match.end(1)].split(',') if project.strip() != '']
+    projects.sort(key=lambda project: project.strip('"').upper())     # 키 순서 (프로젝트 키 순)
+    if len(projects) < 2:
+        return [query]
+    return [query[:match.start()] + 'project = ' + project + query[match.end():] for project in projects]
+
+# 쿼리 결과의 이슈 수
+def count_issues(jira, query):
+    return search_issue_records(jira, ordered_query(query), 0, 1, fields=['created']).total
+
+# JQL의 날짜 조건은 클라이언트 PC가 아니라 Jira 사용자 프로필의 시간대로 해석되므로 그 시간대를 한 번 읽어서 jira 객체에 저장해 둠
+# 읽지 못하면 (프로필에 시간대가 없거나 tzdata가 없어서 모르는 이름) 로컬 시간대를 쓰고 알려줌
+def jql_timezone(jira):
+    tz = getattr(jira, 'profile_timezone', None)
+    if tz is not None:
+        return tz
+    try:
+        tz = ZoneInfo(jira.myself()['timeZone'])
+    except (JIRAError, KeyError, ValueError, ZoneInfoNotFoundError) as err:
+        print("Jira 프로필 시간대를 읽지 못해서 로컬 시간대로 날짜 조건을 만듭니다: {}".format(err))
+        tz = datetime.now().astimezone().tzinfo
+    jira.profile_timezone = tz
+    return tz
+
+# JQL 날짜 조건에 넣을 시각 (프로필 시간대, 분 단위)
+def jql_datetime(jira, value):
+    return value.astimezone(jql_timezone(jira)).strftime('%Y/%m/%d %H:%M')
+
+# 쿼리 결과 중 가장 이른 (또는 가장 늦은) created 시각 (프로필 시간대, 분 단위)
+# 결과가 없으면 (이슈 수를 센 뒤에 지워졌거나 옮겨진 경우) None
+def created_bound(jira, query, latest):
+    order_by = ' ORDER BY created DESC' if latest else ' ORDER BY created ASC'
+    issues = search_issue_records(jira, strip_order_by(query) + order_by, 0, 1, fields=['created'])
+    if len(issues) == 0 or issues[0].created is None:
+        return None
+    return parse_jira_datetime(issues[0].created).astimezone(jql_timezone(jira)).replace(tzinfo=None, second=0, microsecond=0)
+
+def strip_order_by(query):
+    position = query.lower().rfind('order by')
+    if position != -1:
+        query = query[:position].rstrip()
+    return query
+
+# created 기간 조건 (since 이상 until 미만, None이면 열어 둠)
+def created_condition(since, until):
+    conditions = []
+    if since is not None:
+        conditions.append('created >= "%s"' % since.strftime('%Y/%m/%d %H:%M'))
+    if until is not None:
+        conditions.append('created < "%s"' % until.strftime('%Y/%m/%d %H:%M'))
+    return ' AND '.join(conditions)
+
+# 쿼리를 created 기간으로 나눔 -> [(쿼리, 이슈 수)] (처음과 마지막 기간은 열어 둠)
+# 처음~마지막 created를 같은 길이의 기간 여러 개로 잘라서 이슈 수를 한꺼번에 세어 보고,
+# 이웃한 기간을 SEARCH_PARTITION_SIZE개 정도가 되도록 묶음
+def split_query_by_created(jira, query, count, executor, partition_size=SEARCH_PARTITION_SIZE):
+    if count <= partition_size:
+        return [(query, count)]
+    first, last = executor.map(lambda latest: created_bound(jira, query, latest), (False, True))
+    if first is None or last is None:
+        # 기간을 정할 수 없으면 나누지 않고 한 검색으로 차례대로 가져옴
+        return [(query, count)]
+    last = last + timedelta(minutes=1)
+
+    slice_count = -(-count // partition_size) * 2
+    step = max((last - first) / slice_count, timedelta(minutes=1))
+    bounds = []
+    since = first
+    while since < last:
+        bounds.append(since)
+        since = (since + step).replace(second=0, microsecond=0)
+        if since <= bounds[-1]:
+            since = bounds[-1] + timedelta(minutes=1)
+    bounds.append(last)
+    slices = list(zip(bounds[:-1], bounds[1:]))
+    counts = list(executor.map(lambda bound: count_issues(jira, add_jql_condition(query, created_condition(*bound))), slices))
+
+    # 이웃한 기간 묶기 -> [(시작, 끝, 이슈 수)]
+    ranges = []
+    for (since, until), slice_issues in zip(slices, counts):
+        if len(ranges) > 0 and ranges[-1][2] + slice_issues <= partition_size:
+            ranges[-1] = (ranges[-1][0], until, ranges[-1][2] + slice_issues)
+        else:
+            ranges.append((since, until, slice_issues))
+
+    partitions = []
+    for seq, (since, until, range_count) in enumerate(ranges):
+        since = None if seq == 0 else since
+        until = None if seq == len(ranges) - 1 else until
+        if since is None and until is None:
+            partitions.append((query, range_count))
+        else:
+            partitions.append((add_jql_condition(query, created_condition(since, until)), range_count))
+    return partitions
+
+# 쿼리를 나눌 검색 목록 -> [(쿼리, 이슈 수)] (이슈 수를 세는 검색은 executor에서 동시에 보냄)
+def plan_search_partitions(jira, query, total, executor, partition_size=SEARCH_PARTITION_SIZE):
+    queries = split_query_by_project(query)
+    if len(queries) == 1:
+        counts = [total]
+    else:
+        counts = list(executor.map(lambda partition_query: count_issues(jira, partition_query), queries))
+    partitions = []
+    for partition_query, count in zip(queries, counts):
+        if count > 0:
+            partitions.extend(split_query_by_created(jira, partition_query, count, executor, partition_size))
+    return partitions
+
+# 쿼리 결과를 페이지 단위로 돌려줌 (iter_issue_pages와 같음)
+# 결과가 SEARCH_PARTITION_MIN_ISSUES보다 많으면 나눠서 workers개 작업이 동시에 가져옴
+# 메모리에는 가져오는 중이거나 차례를 기다리는 나눈 검색 (최대 workers * 2개)의 이슈만 둠
+def iter_issue_pages_parallel(jira, query, page_size=SEARCH_PAGE_SIZE, fields=None, workers=SEARCH_PARTITION_WORKERS):
+    # 첫 페이지로 결과 수를 확인함 (나누지 않으면 그대로 이어서 씀)
+    first_page = search_issue_records(jira, ordered_query(query), 0, page_size, fields=fields)
+    if workers <= 1 or first_page.total <= SEARCH_PARTITION_MIN_ISSUES or not can_partition_query(query):
+        yield first_page
+        if len(first_page) < first_page.total:
+            for issues in iter_issue_pages_from(jira, query, len(first_page), page_size, fields):
+                yield issues
+        return
+
+    # 나눈 검색 하나의 결과를 모두 가져옴 (합치는 쪽이 멈췄으면 중간에 그만둠)
+    def fetch_partition(partition_query):
+        issues = []
+        for page in iter_issue_pages(jira, partition_query, page_size, fields):
+            if stop.is_set():
+                break
+            issues.extend(page)
+        return issues
+
+    configure_connection_pool(jira, workers + WATCHER_FETCH_WORKERS)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # 작업마다 나눈 검색이 두 개 이상 돌아가도록 크기를 정함
+        partition_size = min(SEARCH_PARTITION_SIZE, max(page_size, -(-first_page.total // (workers * 2))))
+        partitions = plan_search_partitions(jira, strip_order_by(query), first_page.total, executor, partition_size)
+        total = sum(count for partition_query, count in partitions)
+        print("  검색을 %d개로 나눠서 동시에 가져옵니다 (이슈 %d개)" % (len(partitions), total))
+
+        pending = []
+        next_partition = 0
+        seen = set()
+        page = []
+        while next_partition < len(partitions) or len(pending) > 0:
+            # 앞의 결과를 기다리는 동안 뒤의 검색도 미리 가져옴
+            while next_partition < len(partitions) and len(pending) < workers * 2:
+                pending.append(executor.submit(fetch_partition, partitions[next_partition][0]))
+                next_partition = next_partition + 1
+
+            # 나눈 순서대로 이어 붙이고, 나눈 검색 사이에 겹친 이슈는 한 번만 돌려줌
+            for issue in pending.pop(0).result():
+                if issue.key in seen:
+                    continue
+                seen.add(issue.key)
+                page.append(issue)
+                if len(page) == page_size:
+                    yield IssueRecordList(page, total)
+                    page = []
+        if len(page) > 0:
+            yield IssueRecordList(page, total)
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+# 여러 키의 이슈를 key in (...) 검색 몇 번으로 가져옴 (key -> 이슈)
+def fetch_issues_by_key(jira, keys, fields=None, chunk_size=KEY_LOOKUP_CHUNK_SIZE):
+    keys = list(dict.fromkeys(keys))    # 중복 제거 (순서 유지)
+    issues_by_key = {}
+    for start in range(0, len(keys), chunk_size):
+        query = "key in (%s)" % ', '.join(keys[start:start + chunk_size])
+        for issue in iter_issues(jira, query, chunk_size, fields, validate_query=False):
+            issues_by_key[issue.key] = issue
+    return issues_by_key
+
+########## HTTP 세션
+# 로그인한 jira 클라이언트를 돌려줌 (USE_ASYNC_TRANSPORT면 asyncio 전송 계층으로 감싸서 돌려줌)
+def open_transport(jira, server, username, password):
+    if not USE_ASYNC_TRANSPORT:
+        return jira
+    try:
+        from JIRA_automation_tool_async import AsyncJira
+    except ImportError as err:
+        raise ImportError('USE_ASYNC_TRANSPORT를 쓰려면 aiohttp를 설치해야 합니다 (pip install aiohttp): {}'.format(err))
+    return AsyncJira(jira, server, (username, password))
+
+# 여러 작업이 jira 클라이언트의 HTTP 세션 하나를 함께 쓰므로 연결 풀 크기를 작업 수 이상으로 맞춤
+def configure_connection_pool(jira, pool_size):
+    session = jira._session
+    if getattr(session, 'pool_size', 0) >= pool_size:
+        return
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.pool_size = pool_size
+
+########## 진행 상황
+# 작업 취소 요청을 받으면 진행 상황을 알리는 곳에서 발생함
+class JobCancelled(Exception):
+    pass
+
+# 오래 걸리는 작업의 진행 상황 (단계, 처리한 수, 전체 수, 초당 처리 수, 남은 시간)과 취소 요청
+# callback(stage, done, total, rate, eta)는 작업 스레드에서 불림 (total, eta를 모르면 -1)
+class Progress:
+    def __init__(self, callback=None, interval=PROGRESS_INTERVAL_SECONDS):
+        self.callback = callback
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+        self.stage = ''
+        self.done = 0
+        self.total = -1
+        self.started = time.monotonic()
+        self.reported = 0.0
+
+    def cancel(self):
+        self.cancelled.set()
+
+    # 취소 요청을 받았으면 JobCancelled를 발생시킴
+    def check(self):
+        if self.cancelled.is_set():
+            raise JobCancelled()
+
+    def start(self, stage, total=-1):
+        with self.lock:
+            self.stage = stage
+            self.done = 0
+            self.total = total
+            self.started = time.monotonic()
+            self.reported = 0.0
+        self.report(force=True)
+
+    def set_total(self, total):
+        with self.lock:
+            self.total = total
+
+    def advance(self, count=1):
+        with self.lock:
+            self.done = self.done + count
+            finished = (self.done == self.total)
+        self.report(force=finished)
+
+    def report(self, force=False):
+        self.check()
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        with self.lock:
+            if not force and now - self.reported < self.interval:
+                return
+            self.reported = now
+            stage, done, total = self.stage, self.done, self.total
+            elapsed = now - self.started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = -1.0
+        if total >= 0 and rate > 0:
+            eta = max(0, total - done) / rate
+        self.callback(stage, done, total, rate, eta)
+
+########## 요청 통계
+# URL -> 엔드포인트 이름 (이슈 키와 숫자 ID는 {key}, {id}로 바꿔서 같은 엔드포인트로 묶음)
+def endpoint_name(method, url):
+    path = urlparse(url).path
+    position = path.find('/rest/')
+    if position != -1:
+        path = path[position:]
+    path = re.sub(r'/[A-Z][A-Z0-9_]*-\d+(?=/|$)', '/{key}', path)
+    path = re.sub(r'(?<!/api)/\d+(?=/|$)', '/{id}', path)     # /rest/api/2의 버전 번호는 그대로 둠
+    return method + ' ' + path
+
+# 요청 통계에 넣지 않을 요청인지 (예: Qt 이슈 목록이 작업과 따로 같은 세션으로 보내는 요청)
+# 스레드마다 따로 가지며, asyncio 전송 계층의 코루틴은 부른 스레드의 값을 이어받음
+untracked_requests = contextvars.ContextVar('untracked_requests', default=False)
+
+@contextmanager
+def requests_untracked():
+    token = untracked_requests.set(True)
+    try:
+        yield
+    finally:
+        untracked_requests.reset(token)
+
+# 작업 하나가 보낸 요청을 엔드포인트별로 모음 (횟수, 오류, 보내고 받은 바이트, 응답 시간 분포)
+# with 블록 안에서만 sessions의 응답 hook으로 기록하고, 끝나면 콘솔에 보여주고 filename에 추가함
+# (requests_untracked() 안에서 보낸 요청은 세지 않음)
+# 예: with RequestStats('이슈 수집하기', [jira._session, codebeamer.session], filename): ...
+class RequestStats:
+    def __init__(self, name, sessions, filename=None):
+        self.name = name
+        self.sessions = list(sessions)
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        for session in self.sessions:
+            session.hooks['response'].append(self.on_response)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for session in self.sessions:
+            session.hooks['response'].remove(self.on_response)
+        self.wall_seconds = time.monotonic() - self.started
+        self.report()
+        if self.filename is not None:
+            self.save(self.filename)
+
+    # requests 응답 hook
+    def on_response(self, response, *args, **kwargs):
+        if untracked_requests.get():
+            return response
+        body = response.request.body
+        if body is None:
+            sent = 0
+        elif isinstance(body, str):
+            sent = len(body.encode('utf-8'))
+        else:
+            sent = len(body)
+        self.record(endpoint_name(response.request.method, response.url), response.status_code,
+                    response.elapsed.total_seconds(), sent, len(response.content))
+        return response
+
+    def record(self, name, status_code, seconds, sent, received):
+        with self.lock:
+            endpoint = self.endpoints.get(name)
+            if endpoint is None:
+                endpoint = {'count': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes_sent': 0, 'bytes_received': 0,
+                            'histogram': [0] * (len(LATENCY_BUCKETS) + 1)}
+                self.endpoints[name] = endpoint
+            endpoint['count'] = endpoint['count'] + 1
+            if status_code >= 400:
+                endpoint['errors'] = endpoint['errors'] + 1
+            endpoint['seconds'] = endpoint['seconds'] + seconds
+            endpoint['max_seconds'] = max(endpoint['max_seconds'], seconds)
+            endpoint['bytes_sent'] = endpoint['bytes_sent'] + sent
+            endpoint['bytes_received'] = endpoint['bytes_received'] + received
+            endpoint['histogram'][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    # 응답 시간 분포에서 p번째 백분위수가 들어 있는 구간의 상한 (마지막 구간이면 최대값)
+    def percentile(self, endpoint, p):
+        target = endpoint['count'] * p / 100.0
+        total = 0
+        for bucket, count in enumerate(endpoint['histogram']):
+            total = total + count
+            if total >= target and count > 0:
+                if bucket < len(LATENCY_BUCKETS):
+                    return min(LATENCY_BUCKETS[bucket], endpoint['max_seconds'])
+                break
+        return endpoint['max_seconds']
+
+    # 시간을 가장 많이 쓴 엔드포인트부터 보여줌
+    def report(self):
+        with self.lock:
+            endpoints = sorted(self.endpoints.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        total = sum(endpoint['count'] for name, endpoint in endpoints)
+        print("  요청 통계 - %s: 요청 %d개, %.2f초" % (self.name, total, self.wall_seconds))
+        if total == 0:
+            return
+        print("    %-44s %7s %5s %9s %9s %9s %9s %9s" % ('엔드포인트', '횟수', '오류', '합계(초)', '평균(ms)', 'p95(ms)', '보냄(KB)', '받음(KB)'))
+        for name, endpoint in endpoints:
+            print("    %-44s %7d %5d %9.2f %9.1f %9.1f %9.1f %9.1f" % (
+                name, endpoint['count'], endpoint['errors'], endpoint['seconds'],
+                endpoint['seconds'] * 1000 / endpoint['count'], self.percentile(endpoint, 95) * 1000,
+                endpoint['bytes_sent'] / 1024, endpoint['bytes_received'] / 1024))
+
+    # 작업별 통계를 파일에 쌓아 둠 (최근 REQUEST_STATS_HISTORY개, 이전 실행과 비교할 때 씀)
+    def save(self, filename):
+        try:
+            with open(filename, 'r', encoding='utf-8') as data_to_read:
+                history = json.load(data_to_read)
+        except (OSError, ValueError):
+            history = []
+        with self.lock:
+            endpoints = json.loads(json.dumps(self.endpoints))
+        history.append({'name': self.name, 'started_at': self.started_at, 'wall_seconds': self.wall_seconds,
+                        'latency_buckets': LATENCY_BUCKETS, 'endpoints': endpoints})
+        with open(filename, 'w', encoding='utf-8') as data_to_write:
+            json.dump(history[-REQUEST_STATS_HISTORY:], data_to_write, ensure_ascii=False, indent=1)
+
+########## 작업 기록 (write-ahead journal)
+# 오래 걸리는 작업이 중간에 멈춰도 (오류, VPN 끊김, 취소) 다시 실행하면 멈춘 곳부터 이어서 하도록
+# 작업 계획과 끝낸 쓰기를 한 줄씩 JSON으로 디스크에 기록함 (기록할 때마다 fsync)
+# - 'plan': 작업 대상 (다시 실행하면 서버에서 다시 찾지 않고 이 목록을 씀)
+# - 서버에 쓰기 전/후의 기록 (예: 'create_begin', 'created', 'watcher_added')
+# 작업을 끝까지 마치면 기록 파일을 지움
+class JobJournal:
+    def __init__(self, filename):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.records = []
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as data_to_read:
+                content = data_to_read.read()
+            # 쓰다가 끊긴 마지막 줄은 버림
+            valid = content[:content.rfind('\n') + 1]
+            if valid != content:
+                with open(filename, 'w', encoding='utf-8') as data_to_write:
+                    data_to_write.write(valid)
+            for line in valid.splitlines():
+                self.records.append(json.loads(line))
+        self.kept = False
+        self.file = open(filename, 'a', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    # 끝까지 마쳤으면 기록을 지우고, 도중에 멈췄거나 실패한 작업이 있으면 다음에 이어서 할 수 있게 남겨 둠
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        if exc_type is None and not self.kept:
+            os.remove(self.filename)
+        else:
+            print("  작업 기록을 남겨 두었습니다. 다시 실행하면 이어서 합니다: %s" % self.filename)
+
+    # 실패한 쓰기가 있으면 부름 (작업 기록을 지우지 않음)
+    def keep(self):
+        self.kept = True
+
+    def write(self, record_type, **values):
+        record = dict(values, type=record_type)
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.records.append(record)
+
+    def find(self, record_type):
+        with self.lock:
+            return [record for record in self.records if record['type'] == record_type]
+
+    # 작업 계획 (없으면 None)
+    def plan(self):
+        plans = self.find('plan')
+        if len(plans) == 0:
+            return None
+        return plans[0]['data']
+
+    # 끝낸 watcher 변경 (이슈 키, watcher) 목록
+    def done_watchers(self, record_type):
+        return set((record['key'], record['watcher']) for record in self.find(record_type))
+
+# 작업 종류와 입력값이 같으면 같은 기록 파일을 씀
+def journal_filename(name, *params):
+    digest = hashlib.sha1(json.dumps(params, ensure_ascii=False).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(JOURNAL_DIR, '%s-%s.jsonl' % (name, digest))
+
+########## 쓰기 작업 실행기
+# 토큰 버킷: 1초에 rate개씩 토큰이 차고, 요청 하나를 보낼 때마다 토큰 하나를 씀 (모든 작업이 함께 씀)
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        if capacity is None:
+            capacity = max(1.0, self.rate)
+        self.capacity = float(capacity)
+        self.tokens = self.capacity
+        self.timestamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    # 지금까지 찬 토큰을 반영함 (lock을 잡고 부를 것)
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+        self.timestamp = now
+
+    def acquire(self, tokens=1):
+        while True:
+            with self.lock:
+                self.refill()
+                if self.tokens >= tokens:
+                    self.tokens = self.tokens - tokens
+                    return
+                wait_seconds = (tokens - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+# 서버 응답에 따라 요청 속도를 스스로 조절하는 토큰 버킷 (AIMD)
+# - 429/503 응답: 속도를 THROTTLE_DECREASE_FACTOR배로 줄이고, Retry-After 동안은 요청을 멈춤
+# - 응답 시간이 목표보다 짧음: 속도를 THROTTLE_INCREASE_STEP만큼 늘림
+# - 응답 시간이 목표보다 김: 속도를 조금 줄임
+# 속도는 min_rate ~ max_rate 사이에서만 바뀌고, max_rate도 THROTTLE_MAX_REQUESTS_PER_SECOND를 넘지 않음
+class AdaptiveRateLimiter(TokenBucket):
+    def __init__(self, rate, min_rate=THROTTLE_MIN_REQUESTS_PER_SECOND, max_rate=THROTTLE_MAX_REQUESTS_PER_SECOND, target_latency=THROTTLE_TARGET_LATENCY_SECONDS):
+        max_rate = min(max_rate, THROTTLE_MAX_REQUESTS_PER_SECOND)
+        TokenBucket.__init__(self, min(rate, max_rate))
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, self.rate)
+        self.target_latency = target_latency
+        self.pause_until = 0.0
+        self.throttled_count = 0
+        self.request_count = 0
+        self.started = time.monotonic()
+
+    def set_rate(self, rate):
+        # lock을 잡고 부를 것
+        self.refill()
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+        self.capacity = max(1.0, self.rate)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def acquire(self, tokens=1):
+        # Retry-After로 멈춘 동안은 기다림
+        while True:
+            with self.lock:
+                wait_seconds = self.pause_until - time.monotonic()
+            if wait_seconds <= 0:
+                break
+            time.sleep(wait_seconds)
+        TokenBucket.acquire(self, tokens)
+        with self.lock:
+            self.request_count = self.request_count + tokens
+
+    # requests 응답 hook (jira._session.hooks['response']에 등록해서 씀)
+    def on_response(self, response, *args, **kwargs):
+        latency = response.elapsed.total_seconds()
+        with self.lock:
+            if response.status_code in (429, 503):
+                self.throttled_count = self.throttled_count + 1
+                self.set_rate(self.rate * THROTTLE_DECREASE_FACTOR)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    self.pause_until = max(self.pause_until, time.monotonic() + retry_after)
+            elif latency <= self.target_latency:
+                self.set_rate(self.rate + THROTTLE_INCREASE_STEP)
+            else:
+                self.set_rate(self.rate * (1.0 - (1.0 - THROTTLE_DECREASE_FACTOR) / 5))
+        return response
+
+    # 실제로 낸 평균 요청 속도와 마지막으로 정해진 요청 속도
+    def report(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        print("  요청 속도: 평균 %.2f개/초, 최종 %.2f개/초 (요청 %d개, 429/503 응답 %d번)" % (self.request_count / elapsed, self.rate, self.request_count, self.throttled_count))
+
+# Retry-After 헤더 (초 또는 HTTP 날짜) -> 기다릴 초
+def parse_retry_after(value):
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+# workers개 작업이 동시에 쓰기 작업을 하되, 서버로 가는 요청은 모두 토큰 버킷 하나를 거침
+# 토큰 버킷은 실행기가 살아 있는 동안 jira 세션의 응답을 보고 요청 속도를 스스로 조절함
+# (requests_per_second는 사용자가 정한 최대 속도이므로, 응답이 빨라도 이보다 빠르게 보내지 않음)
+# 작업 안에서 서버에 요청할 때는 executor.call(add_watcher_id, ...)처럼 call()을 거칠 것
+class WriteExecutor:
+    def __init__(self, jira, workers=WRITE_WORKERS, requests_per_second=WRITE_REQUESTS_PER_SECOND, progress=None):
+        configure_connection_pool(jira, workers)
+        self.jira = jira
+        self.progress = progress or Progress()
+        self.limiter = AdaptiveRateLimiter(requests_per_second, max_rate=requests_per_second)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = {}
+        self.failures = []          # 실패한 작업 이름
+        jira._session.hooks['response'].append(self.limiter.on_response)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 도중에 멈췄으면 아직 시작하지 않은 작업은 버림
+        self.executor.shutdown(wait=True, cancel_futures=(exc_type is not None))
+        invalidate_query_cache()
+        self.jira._session.hooks['response'].remove(self.limiter.on_response)
+        self.limiter.report()
+
+    def call(self, function, *args, **kwargs):
+        self.progress.check()
+        self.limiter.acquire()
+        return function(*args, **kwargs)
+
+    # name은 실패했을 때 보여줄 이름 (예: 이슈 키)
+    def submit(self, name, function, *args, **kwargs):
+        future = self.executor.submit(function, *args, **kwargs)
+        self.futures[future] = name
+        return future
+
+    # 모든 작업이 끝날 때까지 기다리고, 실패한 작업은 이름과 오류를 보여줌 (작업 결과 목록을 돌려줌)
+    # 취소 요청을 받으면 남은 작업을 버리고 JobCancelled를 발생시킴
+    def wait(self, stage='쓰기 작업'):
+        self.progress.start(stage, len(self.futures))
+        results = []
+        for future in as_completed(self.futures):
+            try:
+                results.append(future.result())
+            except JobCancelled:
+                pass
+            except Exception as err:
+                self.failures.append(self.futures[future])
+                print("[%s] 실패" % self.futures[future])
+                print("    {} **".format(err))
+            try:
+                self.progress.advance()
+            except JobCancelled:
+                for pending in self.futures:
+                    pending.cancel()
+                self.futures = {}
+                raise
+        self.futures = {}
+        return results
+
+# 입력받은 숫자 문자열 (비어 있으면 기본값)
+def parse_number(text, default):
+    if text is None or text.strip() == '':
+        return default
+    return type(default)(text)
+
+########## Watcher
+# 이슈 하나의 watcher 목록을 문자열 리스트로 가져옴
+def get_watcher_list(jira, issue):
+    watcher_list = []
+    watchers = jira.watchers(issue)
+    for watcher in watchers.watchers:
+        watcher_list.append(str(watcher))
+    return watcher_list
+
+# jira.add_watcher/remove_watcher는 부를 때마다 사용자를 다시 검색하므로 (user/search),
+# UserResolver로 찾아 둔 사용자 ID로 바로 요청함
+def add_watcher_id(jira, key, user_id):
+    jira._session.post(jira._get_url('issue/%s/watchers' % key), data=json.dumps(user_id))
+
+def remove_watcher_id(jira, key, user_id):
+    if getattr(jira, '_is_cloud', False):
+        params = {'accountId': user_id}
+    else:
+        params = {'username': user_id}
+    jira._session.delete(jira._get_url('issue/%s/watchers' % key), params=params)
+
+# 여러 이슈의 watcher 목록을 동시에 가져옴 (결과는 issues 순서 그대로)
+def iter_watcher_lists(jira, issues, executor):
+    # asyncio 전송 계층이면 스레드 없이 이벤트 루프에서 한 번에 동시에 가져옴
+    if hasattr(jira, 'watcher_lists'):
+        return jira.watcher_lists(issues)
+    return executor.map(lambda issue: get_watcher_list(jira, issue), issues)
+
+def fetch_watcher_lists(jira, issues, workers=WATCHER_FETCH_WORKERS):
+    configure_connection_pool(jira, workers)
+    # 작업 스레드도 부른 스레드처럼 요청 통계에 넣을지 말지를 따름
+    with ThreadPoolExecutor(max_workers=workers, initializer=untracked_requests.set, initargs=(untracked_requests.get(),)) as executor:
+        return list(iter_watcher_lists(jira, issues, executor))
+
+########## 이슈 수집하기 (내보내기 형식)
+# 이슈 하나(IssueRecord, watcher 목록)는 한 번만 내보내기 줄(ExportRow)로 만들고, 형식마다 같은 줄을 받아서 자기 파일에 씀
+# - csv: 이슈 업데이트가 읽는 EUC-KR csv (기존 형식 그대로, 목록은 ['a', 'b'] 형태)
+# - utf8_csv: UTF-8 csv (목록은 JSON 배열)
+# - jsonl: 한 줄에 이슈 하나씩 JSON (gzip 압축)
+# - sqlite: issues 테이블 하나 (목록은 JSON 배열)
+# - parquet: 열 단위로 압축한 파일 (pyarrow 필요, 목록은 문자열 목록 열)
+EXPORT_COLUMNS = ['key', 'parent_key', 'project', 'summary', 'issuetype', 'priority', 'components', 'labels', 'hmc_project',
+                  'status', 'resolution', 'assignee', 'reporter', 'watchers', 'duedate', 'created', 'updated', 'description']
+EXPORT_LIST_COLUMNS = ['components', 'labels', 'watchers']
+EXPORT_EXTENSIONS = {'csv': '.csv', 'utf8_csv': '.utf8.csv', 'jsonl': '.jsonl.gz', 'sqlite': '.sqlite', 'parquet': '.parquet'}
+
+ExportRow = namedtuple('ExportRow', EXPORT_COLUMNS)
+
+def export_row(issue, watcher_list):
+    return ExportRow(issue.key, issue.parent_key, issue.project, issue.summary, issue.issuetype, issue.priority, issue.components, issue.labels, issue.hmc_project,
+                     issue.status, issue.resolution, issue.assignee, issue.reporter, tuple(watcher_list), issue.duedate, issue.created, issue.updated, issue.description)
+
+# 목록 열을 JSON 배열 문자열로 바꾼 줄
+def flat_export_row(row):
+    return tuple(json.dumps(value, ensure_ascii=False) if isinstance(value, tuple) else value for value in row)
+
+# 한 페이지의 내보내기 줄 (목록 열을 JSON으로 바꾼 줄은 utf8_csv, sqlite가 함께 쓰므로 한 번만 만듦)
+class ExportPage:
+    def __init__(self, rows):
+        self.rows = rows
+        self.flat = None
+
+    def flat_rows(self):
+        if self.flat is None:
+            self.flat = [flat_export_row(row) for row in self.rows]
+        return self.flat
+
+# 형식별 파일 이름: csv 파일 이름에서 확장자만 바꿈 (예: issues.csv -> issues.jsonl.gz)
+def export_filename(filename, export_format):
+    if export_format == 'csv':
+        return filename
+    return os.path.splitext(filename)[0] + EXPORT_EXTENSIONS[export_format]
+
+# csv 파일에는 EUC-KR로 쓸 수 없는 글자(이모지 등)만 &#숫자; 로 적고 (xmlcharrefreplace), 읽을 때 원래 글자로 되돌림
+# 원래 들어 있던 '&#'는 '&#38;#'으로 적어서 되돌릴 때 구분함
+CHAR_REFERENCE_PATTERN = re.compile(r'&#(\d+);')
+
+def escape_csv_text(value):
+    if value is None or '&#' not in value:
+        return value
+    return value.replace('&#', '&#38;#')
+
+def unescape_csv_text(value):
+    if '&#' not in value:
+        return value
+    return CHAR_REFERENCE_PATTERN.sub(lambda match: chr(int(match.group(1))) if int(match.group(1)) <= sys.maxunicode else match.group(0), value)
+
+# 이슈 하나를 csv 파일의 한 줄로 만듦 (머리말은 CSV_HEADER)
+def legacy_csv_row(row):
+    cells = ['', row.key, row.project, row.summary, row.issuetype, row.priority, list(row.components), list(row.labels), row.hmc_project,
+             row.status, row.resolution, row.assignee, row.reporter, list(row.watchers), row.duedate, row.created, row.description]
+    return [escape_csv_text(str(cell)) if isinstance(cell, list) else escape_csv_text(cell) for cell in cells]
+
+# csv 파일을 한 줄씩 읽음 (&#숫자; 로 적은 글자는 원래 글자로 되돌림)
+def read_issue_csv(filename_to_read):
+    with open(filename_to_read, 'r', encoding='euc-kr', newline='') as data_to_read:
+        for line in csv.reader(data_to_read):
+            yield [unescape_csv_text(cell) for cell in line]
+
+# 다른 형식은 임시 파일에 쓰고, 끝까지 마쳤을 때만 원래 이름으로 바꿈 (도중에 멈추면 이전 파일이 그대로 남음)
+def finish_export_file(temp_filename, filename, complete):
+    if complete:
+        os.replace(temp_filename, filename)
+    else:
+        os.remove(temp_filename)
+
+# csv: 페이지를 다 쓸 때마다 디스크에 반영함 (변경분 수집하기, 이슈 업데이트가 이 파일을 읽음)
+class CsvSink:
+    def __init__(self, filename):
+        self.file = open(filename, 'w', encoding='euc-kr', errors='xmlcharrefreplace', newline='')
+        self.csvwriter = csv.writer(self.file, delimiter=',')
+        self.csvwriter.writerow(CSV_HEADER)
+
+    def write(self, page):
+        for row in page.rows:
+            self.csvwriter.writerow(legacy_csv_row(row))
+        self.file.flush()
+
+    def close(self, complete):
+        self.file.close()
+
+class Utf8CsvSink:
+    def __init__(self, filename):
+        self.filename = filename
+        self.temp_filename = filename + '.tmp'
+        # Excel에서 바로 열 수 있게 BOM을 붙임
+        self.file = open(self.temp_filename, 'w', encoding='utf-8-sig', newline='')
+        self.csvwriter = csv.writer(self.file, delimiter=',')
+        self.csvwriter.writerow(EXPORT_COLUMNS)
+
+    def write(self, page):
+        self.csvwriter.writerows(page.flat_rows())
+
+    def close(self, complete):
+        self.file.close()
+        finish_export_file(self.temp_filename, self.filename, complete)
+
+class JsonlSink:
+    def __init__(self, filename):
+        self.filename = filename
+        self.temp_filename = filename + '.tmp'
+        self.file = gzip.open(self.temp_filename, 'wt', encoding='utf-8', compresslevel=6)
+
+    def write(self, page):
+        for row in page.rows:
+            self.file.write(json.dumps(row._asdict(), ensure_ascii=False) + '\n')
+
+    def close(self, complete):
+        self.file.close()
+        finish_export_file(self.temp_filename, self.filename, complete)
+
+class SqliteSink:
+    def __init__(self, filename):
+        self.filename = filename
+        self.temp_filename = filename + '.tmp'
+        if os.path.exists(self.temp_filename):
+            os.remove(self.temp_filename)
+        self.connection = sqlite3.connect(self.temp_filename)
+        # 끝까지 마친 파일만 쓰므로 쓰는 동안에는 저널을 남기지 않음
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("CREATE TABLE issues (key TEXT PRIMARY KEY, %s)" % ', '.join('%s TEXT' % name for name in EXPORT_COLUMNS[1:]))
+        self.insert = "INSERT OR REPLACE INTO issues VALUES (%s)" % ', '.join('?' * len(EXPORT_COLUMNS))
+
+    def write(self, page):
+        with self.connection:
+            self.connection.executemany(self.insert, page.flat_rows())
+
+    def close(self, complete):
+        if complete:
+            # 색인은 다 넣은 뒤에 한 번에 만듦
+            with self.connection:
+                for name in ['parent_key', 'project', 'status', 'assignee']:
+                    self.connection.execute("CREATE INDEX issues_%s ON issues (%s)" % (name, name))
+        self.connection.close()
+        finish_export_file(self.temp_filename, self.filename, complete)
+
+# parquet: EXPORT_PARQUET_ROW_GROUP_SIZE개씩 열로 모아서 zstd로 압축해 씀
+class ParquetSink:
+    def __init__(self, filename):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as err:
+            raise ImportError('parquet 형식으로 내보내려면 pyarrow를 설치해야 합니다 (pip install pyarrow): {}'.format(err))
+        self.pyarrow = pyarrow
+        self.filename = filename
+        self.temp_filename = filename + '.tmp'
+        self.schema = pyarrow.schema([(name, pyarrow.list_(pyarrow.string()) if name in EXPORT_LIST_COLUMNS else pyarrow.string()) for name in EXPORT_COLUMNS])
+        self.writer = pyarrow.parquet.ParquetWriter(self.temp_filename, self.schema, compression='zstd')
+        self.columns = [[] for name in EXPORT_COLUMNS]
+        self.count = 0
+
+    def write(self, page):
+        for column, values in zip(self.columns, zip(*page.rows)):
+            column.extend(values)
+        self.count = self.count + len(page.rows)
+        if self.count >= EXPORT_PARQUET_ROW_GROUP_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.count == 0:
+            return
+        arrays = [self.pyarrow.array(column, type=field.type) for column, field in zip(self.columns, self.schema)]
+        self.writer.write_table(self.pyarrow.Table.from_arrays(arrays, schema=self.schema))
+        self.columns = [[] for name in EXPORT_COLUMNS]
+        self.count = 0
+
+    def close(self, complete):
+        if complete:
+            self.flush()
+        self.writer.close()
+        finish_export_file(self.temp_filename, self.filename, complete)
+
+EXPORT_SINKS = {'csv': CsvSink, 'utf8_csv': Utf8CsvSink, 'jsonl': JsonlSink, 'sqlite': SqliteSink, 'parquet': ParquetSink}
+
+def open_export_sinks(filename, formats):
+    for export_format in formats:
+        if export_format not in EXPORT_SINKS:
+            raise ValueError("알 수 없는 내보내기 형식입니다: %s (%s 중에서 고를 것)" % (export_format, ', '.join(EXPORT_SINKS)))
+    sinks = []
+    try:
+        for export_format in formats:
+            sinks.append(EXPORT_SINKS[export_format](export_filename(filename, export_format)))
+    except Exception:
+        close_export_sinks(sinks, False)
+        raise
+    return sinks
+
+def close_export_sinks(sinks, complete):
+    for sink in sinks:
+        sink.close(complete)
+
+# 쿼리 결과를 페이지 단위로 받아서 바로 formats(기본값 EXPORT_FORMATS)의 파일에 기록함 (파일은 한 번만 열어 둠)
+# 각 페이지의 watcher 목록은 workers개 작업이 동시에 가져오고, 기록은 원래 순서대로 함
+# store가 주어지면 가져온 이슈를 로컬 이슈 저장소에도 함께 기록함
+def export_issues_csv(jira, query, filename_to_write, workers=WATCHER_FETCH_WORKERS, store=None, progress=None, formats=None):
+    progress = progress or Progress()
+    formats = formats or EXPORT_FORMATS
+    configure_connection_pool(jira, workers)
+    sinks = open_export_sinks(filename_to_write, formats)
+    if store is not None:
+        store.begin_full_sync(query)
+    progress.start('이슈 수집하기')
+
+    count = 0
+    watermark = None
+    complete = False
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for issues in iter_issue_pages_parallel(jira, query, fields=export_fields()):
+                progress.set_total(issues.total)
+                watcher_lists = iter_watcher_lists(jira, issues, executor)
+                page = []
+                rows = []
+                for issue, watcher_list in zip(issues, watcher_lists):
+                    rows.append(export_row(issue, watcher_list))
+                    watermark = newer_watermark(watermark, issue.updated)
+                    page.append((issue, watcher_list))
+                    count = count + 1
+                export_page = ExportPage(rows)
+                for sink in sinks:
+                    sink.write(export_page)
+                if store is not None:
+                    store.put_issues(query, page)
+                progress.advance(len(page))
+                print("  %d개 이슈 기록 완료" % count)
+        complete = True
+    finally:
+        close_export_sinks(sinks, complete)
+
+    # 변경분 수집하기는 csv 파일에만 합치므로 csv 파일을 만들었을 때만 기록함
+    if 'csv' in formats:
+        save_watermark(filename_to_write, query, watermark)
+    if store is not None:
+        store.set_watermark(query, watermark)
+    return count
+
+########## 이슈 변경분 수집하기 (CSV)
+# 마지막으로 수집한 이슈 중 가장 최근의 updated 시각을 csv 파일 옆에 저장해 둠 (예: issues.csv.watermark.json)
+def watermark_filename(filename):
+    return filename + '.watermark.json'
+
+def load_watermark(filename, query):
+    try:
+        with open(watermark_filename(filename), 'r', encoding='utf-8') as data_to_read:
+            data = json.load(data_to_read)
+    except (OSError, ValueError):
+        return None
+    # 쿼리가 바뀌었으면 이전 기록은 쓸 수 없음
+    if data.get('query') != query:
+        return None
+    return data.get('updated')
+
+def save_watermark(filename, query, watermark):
+    if watermark is None:
+        return
+    with open(watermark_filename(filename), 'w', encoding='utf-8') as data_to_write:
+        json.dump({'query': query, 'updated': watermark}, data_to_write)
+
+def parse_jira_datetime(value):
+    # 예: 2023-08-30T10:11:12.000+0900
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+
+def newer_watermark(watermark, updated):
+    if updated is None:
+        return watermark
+    if watermark is None or parse_jira_datetime(updated) > parse_jira_datetime(watermark):
+        return updated
+    return watermark
+
+# JQL의 날짜 조건은 분 단위이고 프로필 시간대를 따르므로 그 시간대로 바꾸고 여유를 둠
+def watermark_to_jql(jira, watermark):
+    since = parse_jira_datetime(watermark) - timedelta(minutes=WATERMARK_OVERLAP_MINUTES)
+    return 'updated >= "%s"' % jql_datetime(jira, since)
+
+# csv 외의 형식 파일은 로컬 이슈 저장소의 쿼리 결과(변경분까지 반영됨)로 다시 만듦
+# 저장소가 없거나 이 쿼리를 전체 동기화한 적이 없으면 바꾸지 않고 알려줌
+def export_store_formats(store, query, filename, formats):
+    formats = [export_format for export_format in formats if export_format != 'csv']
+    if len(formats) == 0:
+        return
+    if store is None or store.get_watermark(query) is None:
+        print("  로컬 이슈 저장소가 없어서 %s 형식 파일은 바꾸지 않았습니다. 전체 수집을 해야 최신 내용이 됩니다." % ', '.join(formats))
+        return
+
+    sinks = open_export_sinks(filename, formats)
+    complete = False
+    try:
+        for rows in store.iter_export_pages(query):
+            export_page = ExportPage(rows)
+            for sink in sinks:
+                sink.write(export_page)
+        complete = True
+    finally:
+        close_export_sinks(sinks, complete)
+
+# 지난번 수집 이후에 바뀐 이슈만 가져와서 기존 csv 파일에 key* 기준으로 합침
+# formats(기본값 EXPORT_FORMATS)의 다른 형식 파일은 로컬 이슈 저장소로 다시 만듦
+# 이전 기록이 없거나 쿼리가 바뀌었거나 full_resync가 True이면 전체를 다시 수집함
+# (삭제되었거나 쿼리 조건에서 빠진 이슈는 전체 수집을 해야 csv 파일에서 없어짐)
+def export_updated_issues_csv(jira, query, filename_to_write, full_resync=False, workers=WATCHER_FETCH_WORKERS, store=None, progress=None, formats=None):
+    progress = progress or Progress()
+    formats = formats or EXPORT_FORMATS
+    watermark = load_watermark(filename_to_write, query)
+    if full_resync or watermark is None or not os.path.exists(filename_to_write):
+        print("  전체 이슈를 다시 수집합니다.")
+        return export_issues_csv(jira, query, filename_to_write, workers, store, progress, formats)
+
+    configure_connection_pool(jira, workers)
+    progress.start('이슈 변경분 수집하기')
+
+    # 바뀐 이슈만 가져옴 (key -> (이슈, watcher 목록))
+    changed_issues = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for issues in iter_issue_pages_parallel(jira, add_jql_condition(query, watermark_to_jql(jira, watermark)), fields=export_fields()):
+            progress.set_total(issues.total)
+            watcher_lists = iter_watcher_lists(jira, issues, executor)
+            page = []
+            for issue, watcher_list in zip(issues, watcher_lists):
+                changed_issues[issue.key] = (issue, watcher_list)
+                watermark = newer_watermark(watermark, issue.updated)
+                page.append((issue, watcher_list))
+            if store is not None:
+                store.put_issues(query, page)
+            progress.advance(len(page))
+    count = len(changed_issues)
+
+    # 기존 csv 파일을 한 줄씩 옮겨 적으면서 바뀐 이슈만 새 내용으로 바꿈
+    temp_filename = filename_to_write + '.tmp'
+    with open(filename_to_write, 'r', encoding='euc-kr', newline='') as data_to_read, open(temp_filename, 'w', encoding='euc-kr', errors='xmlcharrefreplace', newline='') as data_to_write:
+        csvwriter = csv.writer(data_to_write, delimiter=',')
+        for line in csv.reader(data_to_read):
+            if len(line) > 1 and line[1] in changed_issues:
+                issue, watcher_list = changed_issues.pop(line[1])
+                csvwriter.writerow(legacy_csv_row(export_row(issue, watcher_list)))
+            else:
+                csvwriter.writerow(line)
+
+        # 새로 생긴 이슈는 맨 뒤에 추가함
+        for issue, watcher_list in changed_issues.values():
+            csvwriter.writerow(legacy_csv_row(export_row(issue, watcher_list)))
+    os.replace(temp_filename, filename_to_write)
+
+    save_watermark(filename_to_write, query, watermark)
+    if store is not None and store.get_watermark(query) is not None:
+        store.set_watermark(query, newer_watermark(store.get_watermark(query), watermark))
+    export_store_formats(store, query, filename_to_write, formats)
+    return count
+
+########## 사용자
+def user_name(user):
+    # 표시 이름 "홍길동 gildong.hong"에서 마지막 영문 이름만 사용하기
+    if user is None:
+        return None
+    return str(user).split(' ')[-1]
+
+# 사용자 이름 -> 사용자 ID (jira._get_user_id) 캐시
+# 같은 사람은 한 번만 조회하고, 오래 안 쓴 사용자부터 지우며 (LRU), TTL이 지나면 다시 조회함
+# filename이 주어지면 실행할 때마다 파일에서 읽고 save()로 저장함
+class UserResolver:
+    def __init__(self, jira, filename=None, size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS):
+        self.jira = jira
+        self.filename = filename
+        self.size = size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()      # 이름 -> (사용자 ID, 만료 시각)
+        self.pending = {}               # 지금 조회 중인 이름 -> threading.Event
+        self.hit_count = 0
+        self.miss_count = 0
+        self.load()
+
+    def load(self):
+        if self.filename is None:
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as data_to_read:
+                data = json.load(data_to_read)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for name, (user_id, expires_at) in data.items():
+            if expires_at > now:
+                self.cache[name] = (user_id, expires_at)
+        while len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+
+    def save(self):
+        if self.filename is None:
+            return
+        with self.lock:
+            data = dict(self.cache)
+        with open(self.filename, 'w', encoding='utf-8') as data_to_write:
+            json.dump(data, data_to_write, ensure_ascii=False)
+
+    # user는 사용자 이름, 표시 이름 또는 사용자 객체
+    # executor가 주어지면 서버 조회는 쓰기 작업 실행기의 요청 속도 제한을 따름
+    def resolve(self, user, executor=None):
+        name = user_name(user)
+        while True:
+            with self.lock:
+                cached = self.cache.get(name)
+                if cached is not None and cached[1] > time.time():
+                    self.cache.move_to_end(name)
+                    self.hit_count = self.hit_count + 1
+                    return cached[0]
+                event = self.pending.get(name)
+                if event is None:
+                    # 이 작업이 조회함
+                    event = threading.Event()
+                    self.pending[name] = event
+                    self.miss_count = self.miss_count + 1
+                    break
+            # 다른 작업이 같은 사람을 조회하는 중이면 끝날 때까지 기다림
+            event.wait()
+
+        try:
+            if executor is not None:
+                user_id = executor.call(self.jira._get_user_id, name)
+            else:
+                user_id = self.jira._get_user_id(name)
+            with self.lock:
+                self.cache[name] = (user_id, time.time() + self.ttl)
+                self.cache.move_to_end(name)
+                while len(self.cache) > self.size:
+                    self.cache.popitem(last=False)
+        finally:
+            with self.lock:
+                del self.pending[name]
+            event.set()
+        return user_id
+
+########## 로컬 이슈 저장소 (SQLite)
+# 내보내기/동기화로 가져온 이슈와 watcher를 디스크에 저장해 두고,
+# 일괄 작업은 이 저장소에서 대상 이슈를 고른 뒤 서버에는 실제 쓰기만 요청함
+# (watcher 변경은 이슈의 updated 시각을 바꾸지 않으므로, 다른 사람이 바꾼 watcher는 전체 동기화를 해야 반영됨)
+class IssueStore:
+    def __init__(self, filename):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS issues (
+                    key TEXT PRIMARY KEY, parent_key TEXT, project TEXT, summary TEXT,
+                    issuetype TEXT, priority TEXT, components TEXT, labels TEXT, hmc_project TEXT,
+                    status TEXT, resolution TEXT, assignee TEXT, assignee_name TEXT, reporter TEXT,
+                    duedate TEXT, created TEXT, updated TEXT, description TEXT);
+                CREATE TABLE IF NOT EXISTS watchers (
+                    key TEXT, watcher TEXT, watcher_name TEXT, PRIMARY KEY (key, watcher_name));
+                CREATE TABLE IF NOT EXISTS query_issues (
+                    query TEXT, key TEXT, PRIMARY KEY (query, key));
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    query TEXT PRIMARY KEY, updated TEXT);
+                CREATE INDEX IF NOT EXISTS issues_parent_key ON issues (parent_key);
+                CREATE INDEX IF NOT EXISTS issues_assignee_name ON issues (assignee_name);
+                CREATE INDEX IF NOT EXISTS issues_summary ON issues (summary);
+                CREATE INDEX IF NOT EXISTS watchers_watcher_name ON watchers (watcher_name);
+                CREATE INDEX IF NOT EXISTS query_issues_key ON query_issues (key);
+            """)
+
+    def close(self):
+        self.connection.close()
+
+    # 동기화 상태 (쿼리별 마지막 updated 시각)
+    def get_watermark(self, query):
+        with self.lock:
+            row = self.connection.execute("SELECT updated FROM sync_state WHERE query = ?", (query,)).fetchone()
+        if row is None:
+            return None
+        return row['updated']
+
+    def set_watermark(self, query, watermark):
+        if watermark is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO sync_state (query, updated) VALUES (?, ?)", (query, watermark))
+
+    # 전체 동기화를 시작할 때 쿼리에 속한 이슈 목록을 비움 (도중에 멈추면 다음에 다시 전체 동기화하게 됨)
+    def begin_full_sync(self, query):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM sync_state WHERE query = ?", (query,))
+            self.connection.execute("DELETE FROM query_issues WHERE query = ?", (query,))
+
+    # (IssueRecord, watcher 목록) 묶음을 저장함
+    def put_issues(self, query, issues_with_watchers):
+        with self.lock, self.connection:
+            for issue, watcher_list in issues_with_watchers:
+                self.connection.execute("INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                    issue.key,
+                    issue.parent_key,
+                    issue.project,
+                    issue.summary,
+                    issue.issuetype,
+                    issue.priority,
+                    json.dumps(list(issue.components), ensure_ascii=False),
+                    json.dumps(list(issue.labels), ensure_ascii=False),
+                    issue.hmc_project,
+                    issue.status,
+                    issue.resolution,
+                    issue.assignee,
+                    user_name(issue.assignee),
+                    issue.reporter,
+                    issue.duedate,
+                    issue.created,
+                    issue.updated,
+                    issue.description,
+                ))
+                self.connection.execute("DELETE FROM watchers WHERE key = ?", (issue.key,))
+                for watcher in watcher_list:
+                    self.connection.execute("INSERT OR REPLACE INTO watchers VALUES (?, ?, ?)", (issue.key, str(watcher), user_name(watcher)))
+                self.connection.execute("INSERT OR IGNORE INTO query_issues VALUES (?, ?)", (query, issue.key))
+
+    # 이슈 하나 (없으면 None)
+    def get_issue(self, key):
+        with self.lock:
+            return self.connection.execute("SELECT * FROM issues WHERE key = ?", (key,)).fetchone()
+
+    # 이슈의 watcher 표시 이름 목록
+    def get_watchers(self, key):
+        with self.lock:
+            rows = self.connection.execute("SELECT watcher FROM watchers WHERE key = ? ORDER BY rowid", (key,)).fetchall()
+        return [row['watcher'] for row in rows]
+
+    # 쿼리에 속한 이슈를 내보내기 줄(ExportRow) 목록으로 page_size개씩 읽음 (프로젝트, 키 번호 순서)
+    def iter_export_pages(self, query, page_size=SEARCH_PAGE_SIZE):
+        with self.lock:
+            keys = [row['key'] for row in self.connection.execute("SELECT key FROM query_issues WHERE query = ?", (query,))]
+        keys.sort(key=lambda key: (key.rsplit('-', 1)[0], int(key.rsplit('-', 1)[1])))
+        for start in range(0, len(keys), page_size):
+            rows = []
+            for key in keys[start:start + page_size]:
+                issue = self.get_issue(key)
+                if issue is None:
+                    continue
+                rows.append(ExportRow(issue['key'], issue['parent_key'], issue['project'], issue['summary'], issue['issuetype'], issue['priority'],
+                                      tuple(json.loads(issue['components'])), tuple(json.loads(issue['labels'])), issue['hmc_project'],
+                                      issue['status'], issue['resolution'], issue['assignee'], issue['reporter'], tuple(self.get_watchers(key)),
+                                      issue['duedate'], issue['created'], issue['updated'], issue['description']))
+            yield rows
+
+    # 쿼리에 속한 이슈 중 name이 assignee 또는 watcher인 이슈
+    def find_issues_involving(self, query, name):
+        with self.lock:
+            return self.connection.execute("""
+                SELECT issues.* FROM issues JOIN query_issues ON query_issues.key = issues.key
+                WHERE query_issues.query = ? AND (issues.assignee_name = ?
+                    OR issues.key IN (SELECT key FROM watchers WHERE watcher_name = ?))
+                ORDER BY issues.key""", (query, name, name)).fetchall()
+
+    # 쿼리에 속한 이슈 중 name이 watcher인 이슈
+    def find_issues_watched_by(self, query, name):
+        with self.lock:
+            return self.connection.execute("""
+                SELECT issues.* FROM issues JOIN query_issues ON query_issues.key = issues.key
+                WHERE query_issues.query = ? AND issues.key IN (SELECT key FROM watchers WHERE watcher_name = ?)
+                ORDER BY issues.key""", (query, name)).fetchall()
+
+    # 도구가 서버에 쓴 내용을 저장소에도 반영함
+    def add_watcher(self, key, watcher):
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO watchers VALUES (?, ?, ?)", (key, str(watcher), user_name(watcher)))
+
+    # csv 파일로 업데이트한 필드를 저장소에도 반영함
+    def update_issue_state(self, key, state, assignee):
+        with self.lock, self.connection:
+            self.connection.execute("""
+                UPDATE issues SET summary = ?, issuetype = ?, priority = ?, components = ?, labels = ?,
+                    hmc_project = ?, assignee = ?, assignee_name = ?, duedate = ?, description = ?
+                WHERE key = ?""", (
+                state['summary'], state['issuetype'], state['priority'],
+                json.dumps(state['components'], ensure_ascii=False), json.dumps(state['labels'], ensure_ascii=False),
+                state[HMC_PROJECT_FIELD], assignee, state['assignee'], state['duedate'], state['description'], key))
+
+    def remove_watcher(self, key, name):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM watchers WHERE key = ? AND watcher_name = ?", (key, name))
+
+# 저장소를 서버와 맞춤: 처음이면 전체를, 이후에는 지난번 동기화 이후에 바뀐 이슈만 가져옴
+def sync_issue_store(jira, store, query, full_resync=False, workers=WATCHER_FETCH_WORKERS, progress=None):
+    progress = progress or Progress()
+    configure_connection_pool(jira, workers)
+
+    watermark = store.get_watermark(query)
+    if full_resync or watermark is None:
+        print("  로컬 이슈 저장소: 전체 동기화")
+        store.begin_full_sync(query)
+        search_query = query
+    else:
+        search_query = add_jql_condition(query, watermark_to_jql(jira, watermark))
+
+    count = 0
+    progress.start('로컬 이슈 저장소 동기화')
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for issues in iter_issue_pages_parallel(jira, search_query, fields=export_fields()):
+            progress.set_total(issues.total)
+            watcher_lists = iter_watcher_lists(jira, issues, executor)
+            page = []
+            for issue, watcher_list in zip(issues, watcher_lists):
+                watermark = newer_watermark(watermark, issue.updated)
+                page.append((issue, watcher_list))
+            store.put_issues(query, page)
+            count = count + len(page)
+            progress.advance(len(page))
+
+    store.set_watermark(query, watermark)
+    print("  로컬 이슈 저장소: %d개 이슈 동기화 완료" % count)
+    return count
+
+########## 이슈 업데이트 (CSV)
+# csv 파일로 수정할 수 있는 필드 (업데이트 시 비교 대상, 커스텀 필드는 이름으로 씀)
+UPDATE_FIELDS = ['summary', 'issuetype', 'priority', 'components', 'labels', HMC_PROJECT_FIELD, 'assignee', 'duedate', 'description']
+
+def empty_if_none(value):
+    if value is None:
+        return ''
+    return str(value)
+
+# 비교할 수 있는 형태의 이슈 상태: csv 파일의 한 줄
+def issue_state_from_csv(line):
+    return {
+        'summary': line[3],
+        'issuetype': line[4],
+        'priority': line[5],
+        'components': sorted(json.loads(line[6].replace("'", "\""))),
+        'labels': sorted(json.loads(line[7].replace("'", "\""))),
+        HMC_PROJECT_FIELD: line[8],
+        'assignee': line[11].split(' ')[-1],
+        'duedate': line[14],
+        'description': line[16],
+    }
+
+# 비교할 수 있는 형태의 이슈 상태: 서버에서 가져온 이슈 (IssueRecord)
+def issue_state_from_issue(issue):
+    return {
+        'summary': empty_if_none(issue.summary),
+        'issuetype': empty_if_none(issue.issuetype),
+        'priority': empty_if_none(issue.priority),
+        'components': sorted(issue.components),
+        'labels': sorted(issue.labels),
+        HMC_PROJECT_FIELD: empty_if_none(issue.hmc_project),
+        'assignee': empty_if_none(user_name(issue.assignee)),
+        'duedate': empty_if_none(issue.duedate),
+        'description': empty_if_none(issue.description),
+    }
+
+# 두 상태에서 값이 다른 필드 이름 목록
+def changed_fields(current_state, new_state):
+    field_names = []
+    for field_name in UPDATE_FIELDS:
+        if current_state[field_name] != new_state[field_name]:
+            field_names.append(field_name)
+    return field_names
+
+# 이슈 상태 중 field_names에 해당하는 필드만 서버에 보낼 형태로 만듦
+def make_update_fields(state, field_names):
+    fields = {}
+    for field_name in field_names:
+        value = state[field_name]
+        if field_name in ('issuetype', 'priority', 'assignee'):
+            fields[field_name] = {'name': value}
+        elif field_name == 'components':
+            fields[field_name] = [{'name': component} for component in value]
+        elif field_name == HMC_PROJECT_FIELD:
+            fields[field_id(field_name)] = {'value': value}
+        else:
+            fields[field_name] = value
+    return fields
+
+# 이슈를 다시 가져오지 않고 키만으로 바뀐 필드만 PUT 함
+def update_issue_fields(jira, key, fields, notify=True):
+    params = {}
+    if not notify:
+        params['notifyUsers'] = 'false'
+    jira._session.put(jira._get_url('issue/' + key), params=params, data=json.dumps({'fields': fields}))
+
+# 업데이트 flag가 입력된 키만 모아서 몇 번의 검색으로 현재 상태를 가져오고, watcher 목록은 동시에 가져옴
+# (key -> 이슈 상태, key -> watcher 목록)
+# watcher 변경은 updated 시각을 바꾸지 않아서 로컬 이슈 저장소의 watcher는 오래되었을 수 있으므로 서버에서 읽음
+def fetch_update_targets(jira, filename_to_read, workers=WATCHER_FETCH_WORKERS):
+    keys = []
+    for line in read_issue_csv(filename_to_read):
+        if(line[0] != 'update' and line[0] != ''):
+            keys.append(line[1])
+
+    current_states = {}
+    current_watchers = {}
+    fields = [field_id(field_name) for field_name in UPDATE_FIELDS]
+    issues = list(fetch_issues_by_key(jira, keys, fields=fields).values())
+    for issue, watcher_list in zip(issues, fetch_watcher_lists(jira, issues, workers)):
+        current_states[issue.key] = issue_state_from_issue(issue)
+        current_watchers[issue.key] = watcher_list
+    print("  업데이트 대상 %d개 이슈의 현재 상태를 가져왔습니다." % len(current_states))
+    return current_states, current_watchers
+
+# 업데이트 flag가 입력된 줄만 현재 상태와 비교해서 바뀐 필드만 서버에 반영함
+# 줄마다 쓰기 작업 실행기에서 동시에 처리함
+def update_issues_from_csv(jira, store, users, filename_to_read, workers=WRITE_WORKERS, requests_per_second=WRITE_REQUESTS_PER_SECOND, progress=None):
+    progress = progress or Progress()
+    progress.start('업데이트 대상 가져오기')
+    current_states, current_watcher_lists = fetch_update_targets(jira, filename_to_read)
+
+    # 줄 하나를 업데이트함 (업데이트했으면 True, 건너뛰었으면 False)
+    def update_issue(executor, line, current_state):
+        key = line[1]
+        new_state = issue_state_from_csv(line)
+
+        # 바뀐 필드만 보냄
+        field_names = changed_fields(current_state, new_state)
+        if len(field_names) > 0:
+            executor.call(update_issue_fields, jira, key, make_update_fields(new_state, field_names), notify = True)
+            store.update_issue_state(key, new_state, line[11])
+
+        # Watcher 추가 (서버에서 읽은 현재 watcher는 건너뜀)
+        current_watchers = set()
+        for watcher in current_watcher_lists[key]:
+            current_watchers.add(user_name(watcher))
+        added_watchers = []
+        watchers_str = json.loads(line[13].replace("'", "\""))
+        for watcher in watchers_str:
+            if user_name(watcher) in current_watchers:
+                continue
+            executor.call(add_watcher_id, jira, key, users.resolve(watcher, executor))
+            store.add_watcher(key, watcher)
+            added_watchers.append(user_name(watcher))
+
+        if len(field_names) == 0 and len(added_watchers) == 0:
+            print("[%s] 바뀐 내용이 없어서 건너뜀" % key)
+            return False
+        print("[%s] 업데이트: 필드 %s, watcher 추가 %s" % (key, field_names, added_watchers))
+        return True
+
+    count_skipped = 0
+    with WriteExecutor(jira, workers, requests_per_second, progress) as executor:
+        for line in read_issue_csv(filename_to_read):
+            if(line[0] != 'update'):    # 머리말이 아닐 경우에만 다음 절차 진행
+                if(line[0] != ''):      # 업데이트 flag가 입력되어 있을 경우
+                    # 현재 상태 가져오기 (서버에 없는 키는 건너뜀)
+                    current_state = current_states.get(line[1])
+                    if current_state is None:
+                        print("[%s] 이슈를 찾을 수 없어서 건너뜀" % line[1])
+                        count_skipped = count_skipped + 1
+                        continue
+                    executor.submit(line[1], update_issue, executor, line, current_state)
+        results = executor.wait('이슈 업데이트')
+
+    count_updated = results.count(True)
+    count_skipped = count_skipped + results.count(False)
+    print("이슈 업데이트: %d개 업데이트, %d개 건너뜀" % (count_updated, count_skipped))
+    users.save()
+
+########## 이슈 복사하고 제목 바꾸기
+# 같은 이슈인지 비교하기 위한 제목
+# 제목 중에는 "...]Analysis"도 있고 "...] Analysis"도 있을 수 있고, 맨 앞에 공백 문자가 들어가는 경우도 있을 수 있다.
+def normalize_summary(summary):
+    return re.sub(r'\]\s+', ']', str(summary).lstrip())
+
+# query 결과 중 제목에 old_title이 들어간 이슈를 복사해서 제목을 new_title로 바꾼 이슈를 만들 목록 -> [[순번, 원래 이슈 키, 새 이슈 정보]]
+# 대상 이슈와 이미 만든 이슈는 서버에서 JQL(summary ~)로 찾음 (대상 이슈는 같은 검색으로 복사할 필드까지 가져옴)
+def plan_clones(jira, query, old_title, new_title, due_date):
+    # 제목이 old_title인 이슈를 가져옴
+    issues = list(iter_issues(jira, add_jql_condition(query, 'summary ~ %s' % jql_string(old_title)), fields=export_fields()))
+
+    # 이미 만들어진 new_title 이슈의 제목을 한 번만 모아 둠 (이번에 만드는 이슈도 추가됨)
+    existing_summaries = set()
+    for another_issue in iter_issues(jira, add_jql_condition(query, 'summary ~ %s' % jql_string(new_title)), fields=['summary']):
+        existing_summaries.add(normalize_summary(another_issue.summary))
+
+    clones = []
+    seq = 1
+    for issue in issues:
+        print("\n[%d] %s: %s" % (seq, issue.key, issue.summary))
+
+        components = []
+        for component in issue.components:
+            components.append({'name': str(component)})
+        labels = []
+        for label in issue.labels:
+            labels.append(label)
+        issue_dict = {
+            'project': {'key': str(issue.project)},     # 키로 지정하면 이슈마다 프로젝트를 조회하지 않음
+            'summary': str(issue.summary).replace(old_title, new_title),
+            'issuetype': {'name': str(issue.issuetype)},
+            'priority': {'name': str(issue.priority)},
+            'components': components,
+            'labels': labels,
+            'duedate': due_date,
+            'versions': [{'name': 'None'}],     # Affects Versions
+            'fixVersions': [{'name': 'None'}],  # Fix Versions
+        }
+        # 값이 없는 필드는 넣지 않음 (str(None)인 'None'을 보내면 그 이슈는 만들지 못함)
+        if issue.hmc_project is not None:
+            issue_dict[field_id(HMC_PROJECT_FIELD)] = {'value': str(issue.hmc_project)}
+        if issue.assignee is not None:
+            issue_dict['assignee'] = {'name': user_name(issue.assignee)}     # 마지막 영문 이름만 사용하기
+        if issue.description is not None:
+            issue_dict['description'] = str(issue.description)
+        if issue.parent_key is not None:
+            issue_dict['parent'] = {'key': str(issue.parent_key)}       # Sub-task의 경우 parent를 지정해야 함
+        print('  입력한 정보: ', issue_dict)
+
+        # 만약 이미 생성된 제목이 있는지 확인할 것
+        new_summary = normalize_summary(issue_dict['summary'])
+        find_already_made_issue = new_summary in existing_summaries
+
+        # 아직 이슈를 생성하지 않았다면 만들 것
+        if(find_already_made_issue == False):
+            existing_summaries.add(new_summary)
+            clones.append([seq, issue.key, issue_dict])
+        else:
+            print('[%d] 이미 생성된 이슈: %s' % (seq, issue.key))
+
+        seq = seq + 1
+    return clones
+
+# 만들기 요청을 보냈지만 결과를 기록하지 못한 이슈가 서버에 만들어졌는지 확인함 (원래 이슈 키 -> 새 이슈 키)
+# 요청을 보낸 시각 이후에 프로젝트에 만들어진 이슈를 한 번 검색해서 제목으로 맞춰 봄
+def find_created_clones(jira, clones, source_keys, since):
+    summaries_by_project = {}
+    for seq, source_key, issue_dict in clones:
+        if source_key in source_keys:
+            summaries = summaries_by_project.setdefault(issue_dict['project']['key'], {})
+            summaries[normalize_summary(issue_dict['summary'])] = source_key
+
+    # since는 로컬 시간으로 기록됨
+    since = datetime.fromisoformat(since) - timedelta(minutes=WATERMARK_OVERLAP_MINUTES)
+    found = {}
+    for project, summaries in summaries_by_project.items():
+        condition = 'project = %s AND created >= "%s"' % (jql_string(project), jql_datetime(jira, since))
+        for issue in iter_issues(jira, condition, fields=['summary']):
+            source_key = summaries.get(normalize_summary(issue.summary))
+            if source_key is not None:
+                found[source_key] = issue.key
+    return found
+
+# 만들 이슈를 모두 정한 뒤, CLONE_BATCH_SIZE개씩 묶어서 한 번에 만들고 (POST /rest/api/2/issue/bulk)
+# 만들어진 이슈에 원래 이슈의 watcher를 복사함 (생성과 watcher 복사는 쓰기 작업 실행기에서 동시에 처리함)
+# 만들 목록과 끝낸 생성/watcher 복사는 작업 기록에 남기므로, 도중에 멈췄다가 다시 실행하면 남은 것만 함
+# 대상 이슈와 watcher는 모두 서버에서 읽으므로 로컬 이슈 저장소(store)는 쓰지 않음 (다른 일괄 작업과 같은 인자를 받음)
+def clone_and_rename_issues(jira, store, users, query, old_title, new_title, due_date, workers=WRITE_WORKERS, requests_per_second=WRITE_REQUESTS_PER_SECOND, progress=None):
+    progress = progress or Progress()
+    with JobJournal(journal_filename('clone', query, old_title, new_title, due_date)) as journal:
+        clones = journal.plan()
+        if clones is None:
+            progress.start('대상 이슈 찾기')
+            clones = plan_clones(jira, query, old_title, new_title, due_date)
+            journal.write('plan', data=clones)
+        else:
+            print("  이전에 멈춘 작업을 이어서 합니다: %s" % journal.filename)
+
+        # 이미 만든 이슈 (원래 이슈 키 -> 새 이슈 키)
+        created_keys = {}
+        for record in journal.find('created'):
+            created_keys[record['source']] = record['key']
+        # 만들기 요청을 보낸 뒤 결과를 기록하기 전에 멈춘 이슈는 서버에 있는지 확인함
+        uncertain = set()
+        since = None
+        for record in journal.find('create_begin'):
+            uncertain.update(record['sources'])
+            since = min(since or record['time'], record['time'])
+        uncertain = uncertain - set(created_keys)
+        if len(uncertain) > 0:
+            for source_key, new_key in find_created_clones(jira, clones, uncertain, since).items():
+                journal.write('created', source=source_key, key=new_key)
+                created_keys[source_key] = new_key
+        added_watchers = journal.done_watchers('watcher_added')
+
+        # 이슈 여러 개를 한 번에 만듦 -> 만들어진 수
+        def create_issues(executor, batch):
+            field_list = []
+            for seq, source_key, issue_dict in batch:
+                field_list.append(issue_dict)
+            journal.write('create_begin', sources=[source_key for seq, source_key, issue_dict in batch], time=datetime.now().isoformat())
+            results = executor.call(jira.create_issues, field_list, prefetch=False)
+
+            count = 0
+            for (seq, source_key, issue_dict), result in zip(batch, results):
+                if result['status'] == 'Success':
+                    print('[%d] 생성된 이슈: %s (원래 이슈: %s)' % (seq, result['issue'], source_key))
+                    journal.write('created', source=source_key, key=str(result['issue']))
+                    created_keys[source_key] = str(result['issue'])
+                    count = count + 1
+                else:
+                    print('[%d] 이슈 생성 실패 (원래 이슈: %s)' % (seq, source_key))
+                    print("    {} **".format(result['error']))
+            return count
+
+        # 원래 이슈의 watcher를 새 이슈에 복사함
+        # (로컬 이슈 저장소의 watcher는 오래되었을 수 있으므로 원래 이슈의 현재 watcher를 서버에서 읽음)
+        def copy_watchers(executor, source_key, new_key):
+            # Watcher 정보는 따로 추가해야 함
+            for watcher in executor.call(get_watcher_list, jira, source_key):
+                if (new_key, watcher) in added_watchers:
+                    continue
+                executor.call(add_watcher_id, jira, new_key, users.resolve(watcher, executor))
+                journal.write('watcher_added', key=new_key, watcher=watcher)
+
+        with WriteExecutor(jira, workers, requests_per_second, progress) as executor:
+            # 1단계: 아직 만들지 않은 이슈를 CLONE_BATCH_SIZE개씩 묶어서 만들기
+            remaining = [clone for clone in clones if clone[1] not in created_keys]
+            for start in range(0, len(remaining), CLONE_BATCH_SIZE):
+                batch = remaining[start:start + CLONE_BATCH_SIZE]
+                executor.submit('%s ~ %s' % (batch[0][1], batch[-1][1]), create_issues, executor, batch)
+            executor.wait('이슈 만들기')
+
+            # 2단계: 만들어진 이슈마다 watcher 복사하기
+            for seq, source_key, issue_dict in clones:
+                if source_key in created_keys:
+                    executor.submit(created_keys[source_key], copy_watchers, executor, source_key, created_keys[source_key])
+            executor.wait('watcher 복사하기')
+            if len(executor.failures) > 0:
+                journal.keep()
+
+    print("  이슈 %d개 생성, %d개 실패" % (len(created_keys), len(clones) - len(created_keys)))
+    users.save()
+
+########## watcher/assignee 조건 검색
+# JQL 문자열 값 (따옴표로 감쌈)
+def jql_string(value):
+    return '"%s"' % str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+# 조건에 맞는 이슈만 서버에서 찾음 (키와 제목만 가져옴)
+# watcher 조건을 쓸 수 없는 서버이면 None을 돌려줌 (이때는 로컬 이슈 저장소에서 찾을 것)
+def search_issues_with_condition(jira, query, condition):
+    issues = []
+    try:
+        for page in iter_issue_pages_parallel(jira, add_jql_condition(query, condition), fields=['summary']):
+            for issue in page:
+                issues.append({'key': issue.key, 'summary': issue.summary})
+    except JIRAError as err:
+        if err.status_code == 400 and 'watcher' in str(err.text).lower():
+            print("  서버에서 watcher 조건을 쓸 수 없어서 로컬 이슈 저장소에서 찾습니다.")
+            return None
+        raise
+    return issues
+
+########## 특정 assignee/watcher인 이슈에 watcher 추가하기
+def add_watchers_to_issues_involving(jira, store, users, query, name_to_find, watcher_list, workers=WRITE_WORKERS, requests_per_second=WRITE_REQUESTS_PER_SECOND, progress=None):
+    progress = progress or Progress()
+    with JobJournal(journal_filename('add_watchers', query, name_to_find, watcher_list)) as journal:
+        issues = journal.plan()
+        if issues is None:
+            # name_to_find가 assignee 또는 watcher인 이슈만 서버에서 찾음
+            progress.start('대상 이슈 찾기')
+            issues = search_issues_with_condition(jira, query, '(watcher = %s OR assignee = %s)' % (jql_string(name_to_find), jql_string(name_to_find)))
+            if issues is None:
+                sync_issue_store(jira, store, query, progress=progress)
+                issues = [{'key': issue['key'], 'summary': issue['summary']} for issue in store.find_issues_involving(query, name_to_find)]
+            journal.write('plan', data=issues)
+        else:
+            print("  이전에 멈춘 작업을 이어서 합니다: %s" % journal.filename)
+        added_watchers = journal.done_watchers('watcher_added')
+
+        def add_watchers(executor, seq, issue):
+            for watcher_name in watcher_list:
+                if (issue['key'], watcher_name) in added_watchers:
+                    continue
+                executor.call(add_watcher_id, jira, issue['key'], users.resolve(watcher_name, executor))
+                store.add_watcher(issue['key'], watcher_name)
+                journal.write('watcher_added', key=issue['key'], watcher=watcher_name)
+            print("[%d][%s : %s] 특정 assignee/watcher인 이슈에 watcher 추가하기: 작업 완료" % (seq, issue['key'], issue['summary']))
+
+        # 찾은 이슈에만 추가하고 싶었던 watcher를 추가함
+        with WriteExecutor(jira, workers, requests_per_second, progress) as executor:
+            seq = 1
+            for issue in issues:
+                executor.submit(issue['key'], add_watchers, executor, seq, issue)
+                seq = seq + 1
+            executor.wait('watcher 추가하기')
+            if len(executor.failures) > 0:
+                journal.keep()
+    users.save()
+
+########## 특정 watcher를 모든 이슈에서 제거하기
+def remove_watcher_from_issues(jira, store, users, query, name_to_delete, workers=WRITE_WORKERS, requests_per_second=WRITE_REQUESTS_PER_SECOND, progress=None):
+    progress = progress or Progress()
+    with JobJournal(journal_filename('remove_watcher', query, name_to_delete)) as journal:
+        issues = journal.plan()
+        if issues is None:
+            # name_to_delete가 watcher인 이슈만 서버에서 찾음
+            progress.start('대상 이슈 찾기')
+            issues = search_issues_with_condition(jira, query, 'watcher = %s' % jql_string(name_to_delete))
+            if issues is None:
+                sync_issue_store(jira, store, query, progress=progress)
+                issues = [{'key': issue['key'], 'summary': issue['summary']} for issue in store.find_issues_watched_by(query, name_to_delete)]
+            journal.write('plan', data=issues)
+        else:
+            print("  이전에 멈춘 작업을 이어서 합니다: %s" % journal.filename)
+        removed_watchers = journal.done_watchers('watcher_removed')
+
+        def remove_watcher(executor, seq, issue, user_id):
+            executor.call(remove_watcher_id, jira, issue['key'], user_id)
+            store.remove_watcher(issue['key'], name_to_delete)
+            journal.write('watcher_removed', key=issue['key'], watcher=name_to_delete)
+            print("[%d][%s : %s] 특정 watcher를 모든 이슈에서 제거하기: 작업 완료" % (seq, issue['key'], issue['summary']))
+
+        # 찾은 이슈에서만 제거함 (이미 제거한 이슈는 건너뜀)
+        issues = [issue for issue in issues if (issue['key'], name_to_delete) not in removed_watchers]
+        if len(issues) == 0:
+            return
+        with WriteExecutor(jira, workers, requests_per_second, progress) as executor:
+            user_id = users.resolve(name_to_delete, executor)
+            seq = 1
+            for issue in issues:
+                executor.submit(issue['key'], remove_watcher, executor, seq, issue, user_id)
+                seq = seq + 1
+            executor.wait('watcher 제거하기')
+            if len(executor.failures) > 0:
+                journal.keep()
+    users.save()
@@ -12,21 +12,270 @@ import csv
 import time
 import random
 from getpass import getpass
-from PySide6.QtCore import QObject, Slot
+from PySide6.QtCore import Qt, QObject, Slot, Signal, QRunnable, QThreadPool, QTimer, QAbstractListModel, QModelIndex
 from PySide6.QtGui import QGuiApplication
 from PySide6.QtQml import QQmlApplicationEngine, QmlElement
 
+import JIRA_automation_tool_common as common
+
 QML_IMPORT_NAME = "io.qt.textproperties"
 QML_IMPORT_MAJOR_VERSION = 1
 
+########## 환경변수
+ISSUE_LIST_FIELDS = ['summary', 'status', 'assignee']               # 이슈 목록에서 가져올 필드
+ISSUE_LIST_ROLES = ['key', 'summary', 'status', 'assignee', 'watchers']     # 이슈 목록 delegate에서 쓰는 이름
+
+########## 백그라운드 작업
+# Bridge의 기능을 작업 스레드에서 실행함 (실행하는 동안에도 GUI가 멈추지 않음)
+# 진행 상황은 bridge의 jobProgress 신호로 QML에 알림 (신호는 GUI 스레드로 전달됨)
+class Job(QRunnable):
+    def __init__(self, bridge, name, function, args):
+        QRunnable.__init__(self)
+        self.bridge = bridge
+        self.name = name
+        self.function = function
+        self.args = args
+        self.progress = common.Progress(self.report)
+
+    def report(self, stage, done, total, rate, eta):
+        self.bridge.jobProgress.emit(stage, done, total, rate, eta)
+
+    def run(self):
+        message = "완료"
+        try:
+            # 작업 동안 보낸 요청을 엔드포인트별로 모아서 끝날 때 보여주고 파일에 쌓아 둠
+            with common.RequestStats(self.name, [jira._session], os.path.join(os.path.dirname(__file__), common.REQUEST_STATS_FILENAME)):
+                self.function(*self.args, self.progress)
+        except common.JobCancelled:
+            message = "취소됨"
+        except Exception as err:
+            print("=" * 100)
+            print("    {} **".format(err))
+            print("=" * 100)
+            message = "실패 ({})".format(err)
+        self.bridge.jobFinished.emit(self.name, message)
+
+# 함수 하나를 작업 스레드에서 실행함 (결과는 함수 안에서 신호로 보낼 것)
+class Task(QRunnable):
+    def __init__(self, function, *args):
+        QRunnable.__init__(self)
+        self.function = function
+        self.args = args
+
+    def run(self):
+        self.function(*self.args)
+
+########## 이슈 목록
+# 쿼리 결과를 화면에 보여주는 목록 모델
+# - 이슈는 목록을 스크롤해서 끝에 가까워질 때만 한 페이지씩 가져옴 (canFetchMore/fetchMore)
+# - watcher는 delegate가 실제로 보여주는 줄만 모아서 한 번에 가져옴
+# - 서버 요청은 작업 스레드에서 하고, 결과는 신호로 GUI 스레드에 넘겨서 목록에 반영함
+@QmlElement
+class IssueListModel(QAbstractListModel):
+    # (쿼리 번호, 가져온 줄 목록, 전체 이슈 수), (쿼리 번호, key -> watcher 목록)
+    pageLoaded = Signal(int, object, int)
+    watchersLoaded = Signal(int, object)
+    # 가져오지 못했을 때: (쿼리 번호, 오류 메시지), (쿼리 번호, key 목록, 오류 메시지)
+    pageFailed = Signal(int, str)
+    watchersFailed = Signal(int, object, str)
+
+    def __init__(self, parent=None):
+        QAbstractListModel.__init__(self, parent)
+        self.generation = 0     # 쿼리를 바꿀 때마다 늘려서 이전 쿼리의 늦은 결과는 버림
+        self.query = None
+        self.rows = []
+        self.row_by_key = {}
+        self.total = -1
+        self.fetching = False
+        self.watcher_requested = set()
+        self.watcher_pending = []
+        self.pageLoaded.connect(self.on_page_loaded)
+        self.watchersLoaded.connect(self.on_watchers_loaded)
+        self.pageFailed.connect(self.on_page_failed)
+        self.watchersFailed.connect(self.on_watchers_failed)
+
+    @Slot(str)
+    def set_query(self, query):
+        self.beginResetModel()
+        self.generation = self.generation + 1
+        self.query = query
+        self.rows = []
+        self.row_by_key = {}
+        self.total = -1
+        self.fetching = False
+        self.watcher_requested = set()
+        self.watcher_pending = []
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def roleNames(self):
+        roles = {}
+        for i, name in enumerate(ISSUE_LIST_ROLES):
+            roles[Qt.UserRole + i] = name.encode()
+        return roles
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role < Qt.UserRole:
+            return None
+        row = self.rows[index.row()]
+        name = ISSUE_LIST_ROLES[role - Qt.UserRole]
+        if name == 'watchers':
+            # 화면에 보이는 줄의 watcher만 가져옴
+            if row['watchers'] is None:
+                self.request_watchers(row['key'])
+                return "..."
+            return ', '.join(row['watchers'])
+        return row[name]
+
+    def canFetchMore(self, parent):
+        if parent.isValid() or self.query is None:
+            return False
+        return self.total < 0 or len(self.rows) < self.total
+
+    def fetchMore(self, parent):
+        if self.fetching or not self.canFetchMore(parent):
+            return
+        self.fetching = True
+        QThreadPool.globalInstance().start(Task(self.load_page, self.generation, self.query, len(self.rows)))
+
+    # 작업 스레드: 한 페이지 가져오기 (목록에 필요한 값만 남기고 이슈 객체는 버림)
+    # 어떤 오류든 신호를 보내야 fetching이 풀려서 다음에 스크롤할 때 다시 가져올 수 있음
+    def load_page(self, generation, query, start_at):
+        rows = []
+        try:
+            # 실행 중인 작업의 요청 통계에는 넣지 않음
+            with common.requests_untracked():
+                issues = common.search_issue_page(jira, query, start_at, fields=ISSUE_LIST_FIELDS)
+            total = issues.total
+            for issue in issues:
+                rows.append({
+                    'key': issue.key,
+                    'summary': common.empty_if_none(issue.summary),
+                    'status': common.empty_if_none(issue.status),
+                    'assignee': common.empty_if_none(issue.assignee),
+                    'watchers': None,
+                })
+        except Exception as err:
+            print("=" * 100)
+            print("    {} **".format(err))
+            print("=" * 100)
+            self.pageFailed.emit(generation, "{}".format(err))
+            return
+        self.pageLoaded.emit(generation, rows, total)
+
+    def on_page_loaded(self, generation, rows, total):
+        if generation != self.generation:
+            return
+        self.fetching = False
+        if len(rows) == 0:
+            self.total = len(self.rows)
+            return
+        self.total = total
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for i, row in enumerate(rows):
+            self.row_by_key[row['key']] = first + i
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def on_page_failed(self, generation, message):
+        if generation != self.generation:
+            return
+        self.fetching = False
+
+    # watcher 요청은 모아 두었다가 이벤트 루프가 한 번 돈 뒤에 한꺼번에 보냄
+    def request_watchers(self, key):
+        if key in self.watcher_requested:
+            return
+        self.watcher_requested.add(key)
+        self.watcher_pending.append(key)
+        if len(self.watcher_pending) == 1:
+            QTimer.singleShot(0, self.flush_watchers)
+
+    def flush_watchers(self):
+        keys = self.watcher_pending
+        self.watcher_pending = []
+        if len(keys) > 0:
+            QThreadPool.globalInstance().start(Task(self.load_watchers, self.generation, keys))
+
+    # 작업 스레드: 여러 이슈의 watcher 목록을 동시에 가져오기
+    def load_watchers(self, generation, keys):
+        try:
+            with common.requests_untracked():
+                watcher_lists = common.fetch_watcher_lists(jira, keys)
+        except Exception as err:
+            print("    {} **".format(err))
+            self.watchersFailed.emit(generation, keys, "{}".format(err))
+            return
+        self.watchersLoaded.emit(generation, dict(zip(keys, watcher_lists)))
+
+    def on_watchers_loaded(self, generation, watchers_by_key):
+        if generation != self.generation:
+            return
+        role = Qt.UserRole + ISSUE_LIST_ROLES.index('watchers')
+        for key, watcher_list in watchers_by_key.items():
+            row = self.row_by_key[key]
+            self.rows[row]['watchers'] = watcher_list
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [role])
+
+    # 가져오지 못한 watcher는 다시 화면에 그릴 때 다시 요청함
+    def on_watchers_failed(self, generation, keys, message):
+        if generation != self.generation:
+            return
+        for key in keys:
+            self.watcher_requested.discard(key)
+
 @QmlElement
 class Bridge(QObject):
+    # 작업 시작 (이름), 진행 상황 (단계, 처리한 수, 전체 수, 초당 처리 수, 남은 시간 초), 작업 끝 (이름, 결과)
+    jobStarted = Signal(str)
+    jobProgress = Signal(str, int, int, float, float)
+    jobFinished = Signal(str, str)
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self.job = None
+        self.jobFinished.connect(self.on_job_finished)
+
+    # 기능 하나를 작업 스레드에서 시작함 (한 번에 하나만 실행함)
+    def start_job(self, name, function, *args):
+        if self.job is not None:
+            print("이미 실행 중인 작업이 있습니다: %s" % self.job.name)
+            return
+        self.job = Job(self, name, function, args)
+        self.jobStarted.emit(name)
+        QThreadPool.globalInstance().start(self.job)
+
+    def on_job_finished(self, name, message):
+        self.job = None
+
+    # 실행 중인 작업 취소하기 (진행 상황을 알리는 다음 시점에 멈춤)
+    @Slot()
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.progress.cancel()
+
     # 로그인
     @Slot(str, str, str, result=bool)
     def login(self, url, username, password):
         try:
             global jira
+            global store
+            global users
             jira = JIRA(server=url, basic_auth=(username, password))
+            jira = common.open_transport(jira, url, username, password)
+            # 로컬 이슈 저장소, 사용자 캐시 열기
+            store = common.IssueStore(os.path.join(os.path.dirname(__file__), common.ISSUE_STORE_FILENAME))
+            users = common.UserResolver(jira, os.path.join(os.path.dirname(__file__), common.USER_CACHE_FILENAME))
+            common.load_field_ids(jira, os.path.join(os.path.dirname(__file__), common.FIELD_CACHE_FILENAME))
+            # 같은 쿼리로 이어서 실행하는 기능은 검색 결과를 다시 씀 (도구가 쓰기를 하면 비움)
+            common.query_cache = common.QueryCache()
             return 1
         except JIRAError as err:
             print("=" * 100)
@@ -37,42 +286,46 @@ class Bridge(QObject):
     # 샘플 테스트 - 이슈 보기 (10개만)
     @Slot(str)
     def get_issues_sample(self, query):
+        self.start_job("이슈 보기 (10개만)", self.get_issues_sample_job, query)
+
+    def get_issues_sample_job(self, query, progress):
         print("이슈 보기 (10개만)")
         print("다음 쿼리를 실행하여 나온 결과 중 최초 10개만 콘솔에 보여 드립니다.")
         print(query)
-        issues = jira.search_issues(query, startAt=1, maxResults=10)
-        for issue in issues:
-            try:
-                print("Parent: %s" % issue.fields.parent)
-            except AttributeError as err:
-                print("Parent: -")
+        # 검색 결과 캐시를 거치므로 같은 쿼리로 이어서 수집하기/이슈 목록 보기를 하면 다시 쓰임
+        issues = common.search_issue_page(jira, query, 1, 10, fields=common.export_fields())
+        watcher_lists = common.fetch_watcher_lists(jira, issues)
+        for issue, watcher_list in zip(issues, watcher_lists):
+            print("Parent: %s" % (issue.parent_key or '-'))
             print("  Key@: %s" % issue.key)
-            print("  Project: %s" % issue.fields.project)
-            print("  Summary: %s" % issue.fields.summary)
+            print("  Project: %s" % issue.project)
+            print("  Summary: %s" % issue.summary)
             print("Details")
-            print("  Type: %s" % issue.fields.issuetype)
-            print("  Priority: %s" % issue.fields.priority)
-            for component in issue.fields.components:
-                print("  Components: %s" % component.name)
-            print("  Labels: %s" % issue.fields.labels)
-            print("  HMC프로젝트: %s" % issue.get_field('customfield_43801'))   # ID: 'customfield_43801', name: 'HMC프로젝트' (커스텀 필드의 값은 jira.fields() 함수로 찾을 수 있음)
-            print("  Status@: %s" % issue.fields.status)
-            print("  Resolution@: %s" % issue.fields.resolution)
+            print("  Type: %s" % issue.issuetype)
+            print("  Priority: %s" % issue.priority)
+            for component in issue.components:
+                print("  Components: %s" % component)
+            print("  Labels: %s" % list(issue.labels))
+            print("  HMC프로젝트: %s" % issue.hmc_project)   # 커스텀 필드 ID는 로그인할 때 jira.fields()로 찾아 둠
+            print("  Status@: %s" % issue.status)
+            print("  Resolution@: %s" % issue.resolution)
             print("People")
-            print("  Assignee: %s" % issue.fields.assignee)
-            print("  Reporter@: %s" % issue.fields.reporter)
-            watchers = jira.watchers(issue)
-            for watcher in watchers.watchers:
+            print("  Assignee: %s" % issue.assignee)
+            print("  Reporter@: %s" % issue.reporter)
+            for watcher in watcher_list:
                 print("  Watcher: %s" % watcher)
             print("Dates")
-            print("  Due: %s" % issue.fields.duedate)
-            print("  Created@: %s" % issue.fields.created)
-            print("Description: %s" % issue.fields.description)
+            print("  Due: %s" % issue.duedate)
+            print("  Created@: %s" % issue.created)
+            print("Description: %s" % issue.description)
             print("\n")
     
     # 샘플 테스트 - 이슈 생성 (1개만)
     @Slot()
     def make_an_issue_sample(self):
+        self.start_job("이슈 생성 (1개만)", self.make_an_issue_sample_job)
+
+    def make_an_issue_sample_job(self, progress):
         # dictionary 자료형
         # components = []
         # for component in issue.fields.components:
@@ -84,8 +337,8 @@ class Bridge(QObject):
             'priority': {'name': 'P2'},
             'components': [{'name': 'ES94111-01'}],
             'labels': ['ccIC24_CLU_WBS'],
-            'customfield_43801': {'value': 'ccIC24'},       # HMC프로젝트
-            'customfield_10104': {'value': 'Comment'},      # Severity
+            common.field_id(common.HMC_PROJECT_FIELD): {'value': 'ccIC24'},
+            common.field_id(common.SEVERITY_FIELD): {'value': 'Comment'},
             'assignee': {'name': 'soonbum.jeong'},
             'duedate': '2023-08-30',
             'description': '설명 텍스트입니다',
@@ -97,173 +350,69 @@ class Bridge(QObject):
         print('입력한 정보: ', issue_dict)
         new_issue = jira.create_issue(issue_dict)
         # Watcher 정보는 따로 추가해야 함
-        jira.add_watcher(new_issue, jira._get_user_id('soonbum.jeong'))
-        #jira.remove_watcher(new_issue, jira._get_user_id('soonbum.jeong'))
+        common.add_watcher_id(jira, new_issue.key, users.resolve('soonbum.jeong'))
+        #common.remove_watcher_id(jira, new_issue.key, users.resolve('soonbum.jeong'))
+        common.invalidate_query_cache()
         print('생성된 이슈: ', new_issue)
 
     # 이슈 관리 - 이슈 수집하기 (CSV)
     @Slot(str)
     def collect_all_issues(self, query):
-        # 모든 이슈를 가져옴
-        issues = jira.search_issues(query, maxResults=0)
-
-        # csv 파일 헤더 작성
-        filename_to_write = os.path.dirname(__file__) + '\\[HKMCCLUHUD][ccIC24] issues.csv'
-        with open(filename_to_write, 'w', encoding='euc-kr', newline='') as data_to_write:
-            csvwriter = csv.writer(data_to_write, delimiter=',')
-            csvwriter.writerow(['update', 'key*', 'project*', 'summary', 'issuetype', 'priority', 'components', 'labels', 'HMC프로젝트', 'status*', 'resolution*', 'assignee', 'reporter*', 'watchers', 'duedate', 'created*', 'description'])
-
-        # 이슈를 csv 파일에 기록하기
-        for issue in issues:
-            components = []
-            for component in issue.fields.components:
-                components.append(component.name)
-
-            hmcProject = issue.get_field('customfield_43801')
-
-            watcher_list = []
-            watchers = jira.watchers(issue)
-            for watcher in watchers.watchers:
-                watcher_list.append(str(watcher))
-
-            with open(filename_to_write, 'a', encoding='euc-kr', newline='') as data_to_write:
-                csvwriter = csv.writer(data_to_write, delimiter=',')
-                try:
-                    csvwriter.writerow(['', issue.key, issue.fields.project, issue.fields.summary, issue.fields.issuetype, issue.fields.priority, components, issue.fields.labels, hmcProject, issue.fields.status, issue.fields.resolution, issue.fields.assignee, issue.fields.reporter, watcher_list, issue.fields.duedate, issue.fields.created, issue.fields.description])
-                except UnicodeEncodeError as err:
-                    print("%s" % issue.key)
-                    print("    {} **".format(err))
-                    description_str = str(issue.fields.description)
-                    description = description_str.encode(encoding = "euc-kr", errors = "ignore")
-                    csvwriter.writerow(['', issue.key, issue.fields.project, issue.fields.summary, issue.fields.issuetype, issue.fields.priority, components, issue.fields.labels, hmcProject, issue.fields.status, issue.fields.resolution, issue.fields.assignee, issue.fields.reporter, watcher_list, issue.fields.duedate, issue.fields.created, description])
+        self.start_job("이슈 수집하기", self.collect_all_issues_job, query)
+
+    def collect_all_issues_job(self, query, progress):
+        # 모든 이슈를 페이지 단위로 가져와서 바로 csv 파일(과 EXPORT_FORMATS의 다른 형식 파일)에 기록함
+        filename_to_write = common.EXPORT_FILENAME
+        count = common.export_issues_csv(jira, query, filename_to_write, store=store, progress=progress)
+        print("이슈 수집하기: %d개 이슈를 기록했습니다." % count)
+
+    # 이슈 관리 - 이슈 변경분 수집하기 (CSV)
+    @Slot(str)
+    def collect_updated_issues(self, query):
+        self.start_job("이슈 변경분 수집하기", self.collect_updated_issues_job, query)
+
+    def collect_updated_issues_job(self, query, progress):
+        # 지난번 수집 이후에 바뀐 이슈만 가져와서 기존 csv 파일에 합침
+        filename_to_write = common.EXPORT_FILENAME
+        count = common.export_updated_issues_csv(jira, query, filename_to_write, store=store, progress=progress)
+        print("이슈 변경분 수집하기: %d개 이슈를 기록했습니다." % count)
 
     # 이슈 관리 - 이슈 업데이트 (CSV)
     @Slot()
     def update_all_issues(self):
+        self.start_job("이슈 업데이트", self.update_all_issues_job)
+
+    def update_all_issues_job(self, progress):
         # csv 파일 가져오기
-        filename_to_read = os.path.dirname(__file__) + '\\[HKMCCLUHUD][ccIC24] issues.csv'
-        with open(filename_to_read, 'r', encoding='euc-kr', newline='') as data_to_read:
-            for line in csv.reader(data_to_read):
-                if(line[0] != 'update'):    # 머리말이 아닐 경우에만 다음 절차 진행
-                    if(line[0] != ''):      # 업데이트 flag가 입력되어 있을 경우
-                        # 키를 이용하여 이슈 가져오기
-                        issue = jira.issue(line[1])
-
-                        components_str = json.loads(line[6].replace("'", "\""))
-                        labels_str = json.loads(line[7].replace("'", "\""))
-                        components = []
-                        for component in components_str:
-                            components.append({'name': component})
-                        labels = []
-                        for label in labels_str:
-                            labels.append(label)
-                        issue_dict = {
-                            'summary': line[3],
-                            'issuetype': {'name': line[4]},
-                            'priority': {'name': line[5]},
-                            'components': components,
-                            'labels': labels,
-                            'customfield_43801': {'value': line[8]},       # HMC프로젝트
-                            'assignee': {'name': line[11].split(' ')[-1]},
-                            'duedate': line[14],
-                            'description': line[16],
-                        }
-                        issue.update(notify = True, fields = issue_dict)
-                        
-                        # Watcher 추가
-                        watchers_str = json.loads(line[13].replace("'", "\""))
-                        for watcher in watchers_str:
-                            jira.add_watcher(issue, jira._get_user_id(str(watcher).split(' ')[-1]))
+        filename_to_read = common.EXPORT_FILENAME
+        common.update_issues_from_csv(jira, store, users, filename_to_read, progress=progress)
 
     # 커스텀 기능 - 이슈 복사하고 제목 바꾸기
     @Slot(str)
     def custom_issue_cloning_and_renaming(self, query):
+        self.start_job("이슈 복사하고 제목 바꾸기", self.custom_issue_cloning_and_renaming_job, query)
+
+    def custom_issue_cloning_and_renaming_job(self, query, progress):
         # 프로젝트명(HKMCCLUHUD) | (ccIC24), 카테고리 (WBS3)
         # 기존 제목 (예: Analysis), 새로운 제목 (예: SyRS), Due Date (예: 2023-08-31) 입력 받기
         # 조건: 다 복사하고, 기존 이슈의 parent를 가져와서 새 이슈의 parent로 연결할 것
         old_title = input("이전 제목(예: Analysis): ")
         new_title = input("새로운 제목(예: SyRS): ")
         due_date = input("마감기한(예: 2023-08-31): ")
-        delay_seconds = input("업데이트 딜레이 초(120): ")
-
-        # 제목이 old_title인 이슈를 가져옴
-        append_query = " AND summary ~ %s" % old_title
-        query_old_title = query + append_query
-        issues = jira.search_issues(query_old_title, maxResults=0)
-
-        seq = 1
-        for issue in issues:
-            print("\n[%d] %s: %s" % (seq, issue.key, issue.fields.summary))
-
-            components = []
-            for component in issue.fields.components:
-                components.append({'name': str(component.name)})
-            labels = []
-            for label in issue.fields.labels:
-                labels.append(label)
-            issue_dict = {
-                'project': str(issue.fields.project),
-                'summary': str(issue.fields.summary).replace(old_title, new_title),
-                'issuetype': {'name': str(issue.fields.issuetype)},
-                'priority': {'name': str(issue.fields.priority)},
-                'components': components,
-                'labels': labels,
-                'customfield_43801': {'value': str(issue.get_field('customfield_43801'))},       # HMC프로젝트
-                'assignee': {'name': str(issue.fields.assignee).split(' ')[-1]},     # 마지막 영문 이름만 사용하기
-                'duedate': due_date,
-                'description': str(issue.fields.description),            
-                'parent': {'key': str(issue.fields.parent.key)},       # Sub-task의 경우 parent를 지정해야 함
-                'versions': [{'name': 'None'}],     # Affects Versions
-                'fixVersions': [{'name': 'None'}],  # Fix Versions
-            }
-            print('  입력한 정보: ', issue_dict)
-
-            # 만약 이미 생성된 제목이 있는지 확인할 것
-            append_query = " AND summary ~ %s" % new_title
-            query_new_title = query + append_query
-            another_query = query_new_title
-            another_issues = jira.search_issues(another_query, maxResults=0)
-            find_already_made_issue = False
-            for another_issue in another_issues:
-                # another_issue 중에는 "...]Analysis"도 있고 "...] Analysis"도 있을 수 있다.
-                comparison_str_1 = str(another_issue.fields.summary)
-                comparison_str_2 = ''
-                if(comparison_str_1.find('] ' + new_title) != -1):
-                    comparison_str_2 = str(comparison_str_1.replace(('] ' + new_title), (']' + new_title)))
-                else:
-                    comparison_str_2 = str(comparison_str_1.replace((']' + new_title), ('] ' + new_title)))
-                # 제목 맨 앞에 공백 문자가 들어가는 경우도 있을 수 있다.
-                comparison_str_3 = ' ' + comparison_str_1
-                comparison_str_4 = ' ' + comparison_str_2
-
-                if(str(issue.fields.summary.replace(old_title, new_title)) == comparison_str_1):
-                    find_already_made_issue = True
-                if(str(issue.fields.summary.replace(old_title, new_title)) == comparison_str_2):
-                    find_already_made_issue = True
-                if(str(issue.fields.summary.replace(old_title, new_title)) == comparison_str_3):
-                    find_already_made_issue = True
-                if(str(issue.fields.summary.replace(old_title, new_title)) == comparison_str_4):
-                    find_already_made_issue = True
-
-            # 아직 이슈를 생성하지 않았다면 만들 것
-            if(find_already_made_issue == False):
-                new_issue = jira.create_issue(issue_dict)
-                # Watcher 정보는 따로 추가해야 함
-                watchers = jira.watchers(issue)
-                for watcher in watchers.watchers:
-                    jira.add_watcher(new_issue, jira._get_user_id(watcher))
-                print('[%d] 생성된 이슈: %s' % (seq, new_issue))
-                time.sleep(int(delay_seconds))  # delay_seconds초 대기
-            else:
-                print('[%d] 이미 생성된 이슈: %s' % (seq, issue.key))
-
-            seq = seq + 1
+        requests_per_second = common.parse_number(input("초당 요청 수(%s): " % common.WRITE_REQUESTS_PER_SECOND), common.WRITE_REQUESTS_PER_SECOND)
+        workers = common.parse_number(input("동시 작업 수(%d): " % common.WRITE_WORKERS), common.WRITE_WORKERS)
+
+        # 제목이 old_title인 이슈를 로컬 이슈 저장소에서 찾아서 복사함
+        common.clone_and_rename_issues(jira, store, users, query, old_title, new_title, due_date, workers, requests_per_second, progress)
 
         print("이슈 복사하고 제목 바꾸기: 작업을 완료했습니다.")
 
     # 커스텀 기능 - 특정 assignee/watcher인 이슈에 watcher 추가하기
     @Slot(str)
     def add_watchers_of_specific_person(self, query):
+        self.start_job("특정 assignee/watcher인 이슈에 watcher 추가하기", self.add_watchers_of_specific_person_job, query)
+
+    def add_watchers_of_specific_person_job(self, query, progress):
         # 예: jaeseon.yoon이 assignee 또는 watcher일 경우, nayoung.choi, hyomin.jun을 watcher로 추가하기
         name_to_find = input("찾고 싶은 assignee/watcher 이름을 입력하세요(예: jaeseon.yoon): ")
         watcher_list = []
@@ -272,55 +421,23 @@ class Bridge(QObject):
         for i in range(int(nPersons)):
             name_to_add = input("%d번째 이름을 입력하세요: " % (i+1))
             watcher_list.append(name_to_add)
-        delay_seconds = input("업데이트 딜레이 초(30): ")
-
-        issues = jira.search_issues(query, maxResults=0)
-        find_person = False
-        seq = 1
-        for issue in issues:
-            # name_to_find에 입력된 이름이 이슈의 assignee 또는 watcher에 있는지 찾아볼 것
-            find_person = False
-            if(str(issue.fields.assignee).split(' ')[-1] == name_to_find):
-                find_person = True
-            watchers = jira.watchers(issue)
-            for watcher in watchers.watchers:
-                if(str(watcher).split(' ')[-1] == name_to_find):
-                    find_person = True
-
-            # 이름을 찾았으면 추가하고 싶었던 watcher를 추가함
-            if(find_person == True):
-                for watcher_name in watcher_list:
-                    jira.add_watcher(issue, watcher_name)
-                print("[%d][%s : %s] 특정 assignee/watcher인 이슈에 watcher 추가하기: 작업 완료" % (seq, issue.key, issue.fields.summary))
-
-            time.sleep(int(delay_seconds))  # delay_seconds초 대기
-            seq = seq + 1
+        requests_per_second = common.parse_number(input("초당 요청 수(%s): " % common.WRITE_REQUESTS_PER_SECOND), common.WRITE_REQUESTS_PER_SECOND)
+        workers = common.parse_number(input("동시 작업 수(%d): " % common.WRITE_WORKERS), common.WRITE_WORKERS)
+
+        common.add_watchers_to_issues_involving(jira, store, users, query, name_to_find, watcher_list, workers, requests_per_second, progress)
 
         print("특정 assignee/watcher인 이슈에 watcher 추가하기: 작업을 완료했습니다.")
 
     # 커스텀 기능 - 특정 watcher를 모든 이슈에서 제거하기
     @Slot(str)
     def del_watcher_from_all_issues(self, query):
+        self.start_job("특정 watcher를 모든 이슈에서 제거하기", self.del_watcher_from_all_issues_job, query)
+
+    def del_watcher_from_all_issues_job(self, query, progress):
         name_to_delete = input("지우고 싶은 watcher 이름을 입력하세요(예: jimin91.song): ")
 
-        issues = jira.search_issues(query, maxResults=0)
-        find_person = False
-        seq = 1
-        for issue in issues:
-            # name_to_delete에 입력된 이름이 이슈의 watcher에 있는지 찾아볼 것
-            find_person = False
-            watchers = jira.watchers(issue)
-            for watcher in watchers.watchers:
-                if(str(watcher).split(' ')[-1] == name_to_delete):
-                    find_person = True
-
-            # 이름을 찾았으면 지우고 싶었던 watcher를 제거함
-            if(find_person == True):
-                jira.remove_watcher(issue, jira._get_user_id(name_to_delete))
-                print("[%d][%s : %s] 특정 watcher를 모든 이슈에서 제거하기: 작업 완료" % (seq, issue.key, issue.fields.summary))
-            
-            seq = seq + 1
-        
+        common.remove_watcher_from_issues(jira, store, users, query, name_to_delete, progress=progress)
+
         print("특정 watcher를 모든 이슈에서 제거하기: 작업을 완료했습니다.")
 
 QML = """
@@ -333,17 +450,48 @@ import io.qt.textproperties 1.0
 Window {
     id: main_window
     width: 900
-    height: 400
+    height: 750
     visible: true
     title: "VLM(JIRA) 자동화 도구"
 
     Bridge {
         id: bridge
     }
+
+    // 작업 스레드의 진행 상황 받기
+    Connections {
+        target: bridge
+        function onJobStarted(name) {
+            job_running = true
+            job_progress.indeterminate = true
+            job_state.text = name + ": 시작"
+        }
+        function onJobProgress(stage, done, total, rate, eta) {
+            var text = stage + ": " + done
+            if(total >= 0) {
+                job_progress.indeterminate = false
+                job_progress.value = (total > 0) ? done / total : 1
+                text = text + " / " + total
+            }
+            else {
+                job_progress.indeterminate = true
+            }
+            text = text + " (" + rate.toFixed(1) + "개/초"
+            if(eta >= 0)    text = text + ", 남은 시간 " + Math.ceil(eta) + "초"
+            job_state.text = text + ")"
+        }
+        function onJobFinished(name, message) {
+            job_running = false
+            job_progress.indeterminate = false
+            job_state.text = name + ": " + message
+        }
+    }
     
     property bool login_success: false
+    property bool job_running: false
     property string url_to_connect: "http://vlm.lge.com/issue/"
     property string query: ""
+    property string issue_list_error: ""
 
     ColumnLayout {
         anchors.fill: parent
@@ -510,6 +658,7 @@ Window {
             }
             Button {
                 id: button_get_issues_sample
+                enabled: !job_running
                 text: "이슈 보기 (10개만)"
                 Layout.margins: 4
                 onClicked: {
@@ -518,6 +667,7 @@ Window {
             }
             Button {
                 id: button_make_an_issue_sample
+                enabled: !job_running
                 text: "이슈 생성 (1개만)"
                 Layout.margins: 4
                 onClicked: {
@@ -532,14 +682,25 @@ Window {
             }
             Button {
                 id: button_collect_all_issues
+                enabled: !job_running
                 text: "이슈 수집하기 (CSV)"
                 Layout.margins: 4
                 onClicked: {
                     bridge.collect_all_issues(jql_query_string.text)
                 }
             }
+            Button {
+                id: button_collect_updated_issues
+                enabled: !job_running
+                text: "이슈 변경분 수집하기 (CSV)"
+                Layout.margins: 4
+                onClicked: {
+                    bridge.collect_updated_issues(jql_query_string.text)
+                }
+            }
             Button {
                 id: button_update_all_issues
+                enabled: !job_running
                 text: "이슈 업데이트 (CSV)"
                 Layout.margins: 4
                 onClicked: {
@@ -554,6 +715,7 @@ Window {
             }
             Button {
                 id: button_custom_issue_cloning_and_renaming
+                enabled: !job_running
                 text: "이슈 복사하고 제목 바꾸기"
                 Layout.margins: 4
                 onClicked: {
@@ -562,6 +724,7 @@ Window {
             }
             Button {
                 id: button_add_watchers_of_specific_person
+                enabled: !job_running
                 text: "특정 assignee/watcher인 이슈에 watcher 추가하기"
                 Layout.margins: 4
                 onClicked: {
@@ -570,6 +733,7 @@ Window {
             }
             Button {
                 id: button_del_watcher_from_all_issues
+                enabled: !job_running
                 text: "특정 watcher를 모든 이슈에서 제거하기"
                 Layout.margins: 4
                 onClicked: {
@@ -577,6 +741,108 @@ Window {
                 }
             }
         }
+        RowLayout {
+            Text {
+                text: "진행 상황"
+                Layout.margins: 4
+            }
+            ProgressBar {
+                id: job_progress
+                from: 0
+                to: 1
+                value: 0
+                Layout.margins: 4
+                implicitWidth: 200
+            }
+            Text {
+                id: job_state
+                text: ""
+                Layout.margins: 4
+            }
+            Button {
+                id: button_cancel_job
+                text: "작업 취소"
+                Layout.margins: 4
+                enabled: job_running
+                onClicked: {
+                    bridge.cancel_job()
+                }
+            }
+        }
+        RowLayout {
+            Text {
+                text: ">> 이슈 목록"
+                Layout.margins: 4
+            }
+            Button {
+                id: button_browse_issues
+                text: "쿼리 결과 보기"
+                Layout.margins: 4
+                enabled: login_success
+                onClicked: {
+                    issue_list_error = ""
+                    issue_model.set_query(jql_query_string.text)
+                }
+            }
+            Text {
+                text: issue_list.count + "개 이슈를 불러옴" + (issue_list_error != "" ? " (불러오기 실패: " + issue_list_error + ")" : "")
+                Layout.margins: 4
+            }
+        }
+        // 화면에 보이는 줄의 delegate만 만들고 스크롤할 때는 다시 씀
+        ListView {
+            id: issue_list
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            Layout.margins: 4
+            clip: true
+            reuseItems: true
+            model: IssueListModel {
+                id: issue_model
+            }
+            // 가져오지 못한 페이지/watcher는 다시 스크롤하거나 그릴 때 다시 요청함
+            Connections {
+                target: issue_model
+                function onPageFailed(generation, message) {
+                    issue_list_error = message
+                }
+                function onWatchersFailed(generation, keys, message) {
+                    issue_list_error = message
+                }
+            }
+            ScrollBar.vertical: ScrollBar {}
+            delegate: RowLayout {
+                required property string key
+                required property string summary
+                required property string status
+                required property string assignee
+                required property string watchers
+                width: ListView.view.width
+                Text {
+                    text: key
+                    Layout.preferredWidth: 120
+                }
+                Text {
+                    text: summary
+                    elide: Text.ElideRight
+                    Layout.fillWidth: true
+                }
+                Text {
+                    text: status
+                    Layout.preferredWidth: 100
+                }
+                Text {
+                    text: assignee
+                    elide: Text.ElideRight
+                    Layout.preferredWidth: 150
+                }
+                Text {
+                    text: watchers
+                    elide: Text.ElideRight
+                    Layout.preferredWidth: 200
+                }
+            }
+        }
     }
 }
 """